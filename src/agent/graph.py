@@ -8,14 +8,19 @@ from src.database.langgraph.checkpointer import get_checkpointer
 
 logger = logging.getLogger(__name__)
 
+# 编译后的 Graph 与用户无关（用户信息通过 config 传入），全局只编译一次
+_compiled_graph: Any | None = None
+
 
 async def get_compiled_graph(
     user_id: int, chat_type: str, group_id: int | None = None
 ) -> Tuple[Any, Dict[str, Any]]:
     """获取编译后的 Graph,返回 (graph, config) 元组"""
-    checkpointer = await get_checkpointer()
+    global _compiled_graph
 
-    compiled_graph = get_supervisor_graph(checkpointer)
+    if _compiled_graph is None:
+        checkpointer = await get_checkpointer()
+        _compiled_graph = get_supervisor_graph(checkpointer)
 
     # 计算 thread_id 和 chat_id
     if chat_type == "private":
@@ -34,4 +39,4 @@ async def get_compiled_graph(
         },
     }
 
-    return compiled_graph, config
+    return _compiled_graph, config
@@ -1,15 +1,14 @@
 """权限检查服务"""
 
 import logging
-from typing import Optional
 
 from aiogram import Bot
 
 from src.auth.models import UserRole
 from src.database.repositories.auth import (
-    is_group_authorized,
+    AccessFlags,
+    check_access,
     is_super_admin,
-    is_user_whitelisted,
 )
 
 logger = logging.getLogger(__name__)
@@ -33,40 +32,33 @@ async def check_group_admin(bot: Bot, group_id: int, user_id: int) -> bool:
         return False
 
 
-async def check_group_authorized(group_id: int) -> bool:
-    """检查群组是否已授权"""
-    return await is_group_authorized(group_id)
-
-
-async def check_whitelist(
-    user_id: int, chat_type: str, group_id: Optional[int] = None
-) -> bool:
-    """检查用户是否在白名单中"""
-    return await is_user_whitelisted(user_id, chat_type, group_id)
+async def check_group_access(group_id: int, user_id: int) -> AccessFlags:
+    """一次查询获取用户在群组中的超管、群组授权和白名单状态"""
+    return await check_access(user_id, "group", group_id)
 
 
 async def check_private_authorization(user_id: int) -> bool:
     """检查私聊授权（超管或私聊白名单）"""
-    # 检查是否是超管
-    if await check_super_admin(user_id):
-        return True
-
-    # 检查是否在私聊白名单中
-    return await check_whitelist(user_id, "private", None)
+    # 超管和私聊白名单在同一次查询中检查
+    access = await check_access(user_id, "private", None)
+    return access.is_super_admin or access.whitelisted
 
 
 async def check_user_role_in_group(bot: Bot, group_id: int, user_id: int) -> str:
     """检查用户在群组中的身份，返回 super_admin/group_admin/authorized_user/unauthorized"""
+    # 超管和群组白名单在同一次查询中获取（通常命中进程内缓存）
+    access = await check_group_access(group_id, user_id)
+
     # 1. 检查是否是超管
-    if await check_super_admin(user_id):
+    if access.is_super_admin:
         return "super_admin"
 
-    # 2. 检查是否是群组管理员
+    # 2. 检查是否是群组管理员（仅非超管时才调用 Telegram API）
     if await check_group_admin(bot, group_id, user_id):
         return "group_admin"
 
     # 3. 检查是否在群组白名单中
-    if await check_whitelist(user_id, "group", group_id):
+    if access.whitelisted:
         return "authorized_user"
 
     # 4. 都不符合
@@ -8,18 +8,18 @@ from aiogram.filters import Command, CommandObject
 from aiogram.fsm.context import FSMContext
 from aiogram.types import KeyboardButton, Message, ReplyKeyboardMarkup
 
-from src.auth.models import UserRole
+from src.auth.models import UserRole, WhitelistEntry
 from src.auth.service import check_super_admin, check_user_role_in_group
-from src.bot.commands import generate_help_text
-from src.bot.filters import PrivateChatFilter, RoleFilter
+from src.bot.commands import get_help_text
+from src.bot.filters import GROUP_CHAT_TYPES, PrivateChatFilter, RoleFilter
 from src.bot.scheduler_service import get_scheduler_service
 from src.bot.states import LocationStates
 from src.database import get_store
 from src.database.repositories.auth import (
     add_to_whitelist,
     authorize_group,
+    iter_whitelist,
     list_authorized_groups,
-    list_whitelist,
     remove_from_whitelist,
     revoke_group_authorization,
     set_user_permission,
@@ -30,6 +30,26 @@ logger = logging.getLogger(__name__)
 # 创建命令路由器
 command_router = Router()
 
+# 白名单列表最多显示的条目数
+_WHITELIST_DISPLAY_LIMIT = 20
+
+
+async def _collect_whitelist(
+    chat_type: Optional[str], group_id: Optional[int]
+) -> tuple[list[WhitelistEntry], int]:
+    """流式读取白名单，只保留前 _WHITELIST_DISPLAY_LIMIT 条，其余仅计数
+
+    Returns:
+        (用于显示的条目, 总条目数)
+    """
+    entries: list[WhitelistEntry] = []
+    total = 0
+    async for entry in iter_whitelist(chat_type, group_id):
+        if total < _WHITELIST_DISPLAY_LIMIT:
+            entries.append(entry)
+        total += 1
+    return entries, total
+
 
 # ==================== 群组授权命令 ====================
 
@@ -159,7 +179,7 @@ async def cmd_whitelist_add(message: Message, command: CommandObject):
         group_id: Optional[int] = None
         chat_type = "private"
 
-        if message.chat.type in ["group", "supergroup"]:
+        if message.chat.type in GROUP_CHAT_TYPES:
             group_id = message.chat.id
             # 群组管理员执行时，自动使用当前群组 ID
             if not is_super:
@@ -225,7 +245,7 @@ async def cmd_whitelist_remove(message: Message, command: CommandObject):
         is_super = await check_super_admin(user_id)
         group_id: Optional[int] = None
 
-        if message.chat.type in ["group", "supergroup"]:
+        if message.chat.type in GROUP_CHAT_TYPES:
             group_id = message.chat.id
             # 群组管理员执行时，自动使用当前群组 ID
             if not is_super:
@@ -288,23 +308,23 @@ async def cmd_whitelist_list(message: Message, command: CommandObject):
         is_super = await check_super_admin(user_id)
         group_id: Optional[int] = None
 
-        if message.chat.type in ["group", "supergroup"]:
+        if message.chat.type in GROUP_CHAT_TYPES:
             group_id = message.chat.id
             # 群组管理员执行时，自动使用当前群组 ID
             if not is_super:
-                entries = await list_whitelist("group", group_id)
+                entries, total = await _collect_whitelist("group", group_id)
                 if not entries:
                     await message.answer("白名单为空。", parse_mode=None)
                     return
 
                 # 格式化列表
                 lines = []
-                for entry in entries[:20]:  # 限制显示数量
+                for entry in entries:
                     lines.append(f"• 用户 {entry.user_id}")
 
                 result = "当前群组白名单列表：\n" + "\n".join(lines)
-                if len(entries) > 20:
-                    result += f"\n... 还有 {len(entries) - 20} 条记录"
+                if total > _WHITELIST_DISPLAY_LIMIT:
+                    result += f"\n... 还有 {total - _WHITELIST_DISPLAY_LIMIT} 条记录"
 
                 await message.answer(result, parse_mode=None)
                 return
@@ -320,7 +340,7 @@ async def cmd_whitelist_list(message: Message, command: CommandObject):
             else:
                 group_id = None
 
-            entries = await list_whitelist(chat_type, group_id)
+            entries, total = await _collect_whitelist(chat_type, group_id)
 
             if not entries:
                 await message.answer("白名单为空。", parse_mode=None)
@@ -328,15 +348,15 @@ async def cmd_whitelist_list(message: Message, command: CommandObject):
 
             # 格式化列表
             lines = []
-            for entry in entries[:20]:  # 限制显示数量
+            for entry in entries:
                 chat_info = f"群组 {entry.group_id}" if entry.group_id else "私聊"
                 lines.append(
                     f"• 用户 {entry.user_id} - {entry.chat_type} - {chat_info}"
                 )
 
             result = "白名单列表：\n" + "\n".join(lines)
-            if len(entries) > 20:
-                result += f"\n... 还有 {len(entries) - 20} 条记录"
+            if total > _WHITELIST_DISPLAY_LIMIT:
+                result += f"\n... 还有 {total - _WHITELIST_DISPLAY_LIMIT} 条记录"
 
             await message.answer(result, parse_mode=None)
 
@@ -560,7 +580,7 @@ async def cmd_help(message: Message):
     # 确定用户角色
     user_role = "super_admin" if is_super else "user"
 
-    # 动态生成帮助文本
-    help_text = generate_help_text(user_role, chat_type, is_group_admin)
+    # 获取帮助文本
+    help_text = get_help_text(user_role, chat_type, is_group_admin)
 
     await message.answer(help_text, parse_mode=None)
@@ -4,6 +4,7 @@
 实际的命令路由由 Aiogram 装饰器处理（command_handlers.py）。
 """
 
+import asyncio
 import logging
 from dataclasses import dataclass
 from typing import List
@@ -21,6 +22,10 @@ from src.database.repositories.auth import list_super_admins
 
 logger = logging.getLogger(__name__)
 
+# 群管可用的命令角色
+# 私聊菜单同样使用（包含管理工具，因为私聊无法区分是否是群管）
+_GROUP_ADMIN_ROLES = frozenset({"group_admin", "user"})
+
 
 @dataclass
 class CommandMetadata:
@@ -126,9 +131,7 @@ def get_commands_by_role(role: str) -> List[CommandMetadata]:
         return COMMANDS_METADATA
     elif role == "group_admin":
         return [
-            cmd
-            for cmd in COMMANDS_METADATA
-            if cmd.required_role in ["group_admin", "user"]
+            cmd for cmd in COMMANDS_METADATA if cmd.required_role in _GROUP_ADMIN_ROLES
         ]
     else:
         return [cmd for cmd in COMMANDS_METADATA if cmd.required_role == "user"]
@@ -204,6 +207,22 @@ def generate_help_text(
     return help_text
 
 
+# 帮助文本缓存：角色、聊天类型、群管身份的组合有限，启动时预先生成
+_HELP_CACHE: dict[tuple[str, str, bool], str] = {
+    (role, chat_type, is_group_admin): generate_help_text(
+        role, chat_type, is_group_admin
+    )
+    for role in ("super_admin", "user")
+    for chat_type in ("private", "group")
+    for is_group_admin in (False, True)
+}
+
+
+def get_help_text(user_role: str, chat_type: str, is_group_admin: bool = False) -> str:
+    """获取预先生成的帮助文本"""
+    return _HELP_CACHE[(user_role, chat_type, is_group_admin)]
+
+
 async def setup_bot_commands(bot: Bot) -> None:
     """
     设置 Bot 命令菜单
@@ -213,8 +232,7 @@ async def setup_bot_commands(bot: Bot) -> None:
     private_user_commands = [
         BotCommand(command=cmd.name, description=cmd.description)
         for cmd in COMMANDS_METADATA
-        if cmd.required_role
-        in ["user", "group_admin"]  # 包含管理工具，因为私聊无法区分是否是群管
+        if cmd.required_role in _GROUP_ADMIN_ROLES
         and "private" in cmd.allowed_chat_types
     ]
     if private_user_commands:
@@ -231,15 +249,21 @@ async def setup_bot_commands(bot: Bot) -> None:
     ]
     if all_private_commands_for_admin:
         super_admin_ids = await list_super_admins()
-        for user_id in super_admin_ids:
-            try:
-                await bot.set_my_commands(
+        # 并发设置，避免逐个等待网络往返
+        results = await asyncio.gather(
+            *[
+                bot.set_my_commands(
                     commands=all_private_commands_for_admin,
                     scope=BotCommandScopeChat(chat_id=user_id),
                 )
-            except Exception as e:
+                for user_id in super_admin_ids
+            ],
+            return_exceptions=True,
+        )
+        for user_id, result in zip(super_admin_ids, results):
+            if isinstance(result, Exception):
                 logger.warning(
-                    f"超管用户 {user_id} 设置指令失败（可能未与机器人对话过）: {e}"
+                    f"超管用户 {user_id} 设置指令失败（可能未与机器人对话过）: {result}"
                 )
 
     # 为群组普通用户设置命令 (AllGroupChats)
@@ -258,8 +282,7 @@ async def setup_bot_commands(bot: Bot) -> None:
     group_admin_commands = [
         BotCommand(command=cmd.name, description=cmd.description)
         for cmd in COMMANDS_METADATA
-        if cmd.required_role in ["group_admin", "user"]
-        and "group" in cmd.allowed_chat_types
+        if cmd.required_role in _GROUP_ADMIN_ROLES and "group" in cmd.allowed_chat_types
     ]
     if group_admin_commands:
         await bot.set_my_commands(
@@ -1,12 +1,37 @@
 """消息过滤器"""
 
-from typing import List
+from typing import List, Optional
 
-from aiogram.filters import Filter, or_f
+from aiogram.filters import Filter
 from aiogram.types import Message
 
 from src.auth.service import check_super_admin, check_user_role_in_group
 
+# 群组聊天类型
+GROUP_CHAT_TYPES = frozenset({"group", "supergroup"})
+
+# 群组中具有管理权限的角色
+_ADMIN_ROLES = frozenset({"super_admin", "group_admin"})
+
+
+def _is_command(text: Optional[str]) -> bool:
+    """判断文本是否为命令（忽略前导空白后以 / 开头）"""
+    if not text:
+        return False
+
+    # 常见情况：首字符即可判定
+    first = text[0]
+    if first == "/":
+        return True
+    if not first.isspace():
+        return False
+
+    # 跳过前导空白后检查首字符，避免 strip() 分配新字符串
+    i, n = 1, len(text)
+    while i < n and text[i].isspace():
+        i += 1
+    return i < n and text[i] == "/"
+
 
 class RoleFilter(Filter):
     """权限过滤器，检查用户是否具有指定角色"""
@@ -18,7 +43,7 @@ class RoleFilter(Filter):
         Args:
             roles: 允许的角色列表，如 ["super_admin", "group_admin"]
         """
-        self.roles = roles
+        self.roles = frozenset(roles)
 
     async def __call__(self, message: Message) -> bool:
         """检查用户权限"""
@@ -45,7 +70,7 @@ class RoleFilter(Filter):
         user_role = await check_user_role_in_group(
             message.bot, message.chat.id, user_id
         )
-        return user_role in ["super_admin", "group_admin"]
+        return user_role in _ADMIN_ROLES
 
 
 class PrivateChatFilter(Filter):
@@ -61,7 +86,7 @@ class GroupChatFilter(Filter):
 
     async def __call__(self, message: Message) -> bool:
         """检查是否为群组消息"""
-        return message.chat.type in ["group", "supergroup"]
+        return message.chat.type in GROUP_CHAT_TYPES
 
 
 class NotCommandFilter(Filter):
@@ -69,8 +94,7 @@ class NotCommandFilter(Filter):
 
     async def __call__(self, message: Message) -> bool:
         """检查是否为非命令消息（不以 / 开头）"""
-        text = message.text or message.caption or ""
-        return not text.strip().startswith("/")
+        return not _is_command(message.text or message.caption)
 
 
 class GroupMentionFilter(Filter):
@@ -78,7 +102,7 @@ class GroupMentionFilter(Filter):
 
     async def __call__(self, message: Message, bot) -> bool:
         """检查是否为群组 @ 提及消息"""
-        if message.chat.type not in ["group", "supergroup"] or not message.entities:
+        if message.chat.type not in GROUP_CHAT_TYPES or not message.entities:
             return False
 
         bot_me = await bot.get_me()
@@ -132,8 +156,21 @@ class ReplyToBotFilter(Filter):
         )
 
 
+class PrivateOrGroupMentionFilter(Filter):
+    """私聊或群组 @ 提及过滤器"""
+
+    async def __call__(self, message: Message, bot) -> bool:
+        """先按聊天类型分流，私聊无需再检查 @ 提及"""
+        chat_type = message.chat.type
+        if chat_type == "private":
+            return True
+        if chat_type not in GROUP_CHAT_TYPES:
+            return False
+        return await group_mention_filter(message, bot)
+
+
 # 组合过滤器：私聊或群组 @ 提及
-PrivateOrMentionFilter = or_f(PrivateChatFilter(), GroupMentionFilter())
+PrivateOrMentionFilter = PrivateOrGroupMentionFilter()
 
 # 组合过滤器：回复消息（私聊或群组）
 ReplyFilter = ReplyMessageFilter()
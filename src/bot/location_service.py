@@ -1,6 +1,11 @@
 """用户位置服务（业务逻辑层）"""
 
+import asyncio
+import functools
 import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, Optional
 
 from timezonefinder import TimezoneFinder
@@ -9,13 +14,62 @@ from src.database.repositories import profiles
 
 logger = logging.getLogger(__name__)
 
-_timezone_finder = TimezoneFinder()
+# 时区查找专用线程池，避免占用默认线程池
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="tz_lookup")
+
+# 时区查询结果缓存（LRU），仅在事件循环线程中访问
+_TZ_CACHE_SIZE = 4096
+_tz_cache: OrderedDict[tuple[float, float], Optional[str]] = OrderedDict()
+
+# 进行中的时区查询，用于合并相同坐标的并发请求
+_inflight: dict[tuple[float, float], asyncio.Future] = {}
+
+
+# 时区查找器实例，首次查询时创建
+_finder: Optional[TimezoneFinder] = None
+
+# 仅在首次创建实例时使用，避免线程池中的并发查询各自加载一份时区数据
+_finder_lock = threading.Lock()
+
+
+def _tf() -> TimezoneFinder:
+    """首次使用时再加载时区数据，未使用位置功能时不占用启动时间和内存
+
+    使用完整多边形查找，边界附近（如新加坡、加里宁格勒）也能得到正确时区
+    """
+    global _finder
+
+    if _finder is not None:
+        return _finder
+
+    with _finder_lock:
+        # 等待锁期间可能已被其他线程创建
+        if _finder is None:
+            _finder = TimezoneFinder()
+
+    return _finder
+
+
+def _lookup_tz(lat_q: float, lon_q: float) -> Optional[str]:
+    """查询时区（在线程池中执行）"""
+    return _tf().timezone_at(lng=lon_q, lat=lat_q)
+
+
+def _on_lookup_done(key: tuple[float, float], future: asyncio.Future) -> None:
+    """查询完成回调：移出进行中的查询，并写入缓存"""
+    _inflight.pop(key, None)
+    if future.cancelled() or future.exception() is not None:
+        return
+
+    _tz_cache[key] = future.result()
+    if len(_tz_cache) > _TZ_CACHE_SIZE:
+        _tz_cache.popitem(last=False)
 
 
 async def get_timezone_from_location(latitude: float, longitude: float) -> str:
     """根据经纬度获取时区
 
-    使用 timezonefinder 获取准确的时区信息
+    使用 timezonefinder 获取时区信息，结果按经纬度缓存
 
     Args:
         latitude: 纬度
@@ -25,8 +79,25 @@ async def get_timezone_from_location(latitude: float, longitude: float) -> str:
         时区字符串（如 'Asia/Shanghai'），如果获取失败则返回 'Unknown'
     """
     try:
-        # 使用 timezonefinder 获取准确的时区
-        return _timezone_finder.timezone_at(lng=longitude, lat=latitude)
+        # 经纬度保留 3 位小数（约 110 米），远小于时区边界的实际精度需求
+        key = (round(latitude, 3), round(longitude, 3))
+
+        # 命中缓存时直接在事件循环中返回
+        if key in _tz_cache:
+            _tz_cache.move_to_end(key)
+            return _tz_cache[key]
+
+        # 未命中时放到线程池中执行，避免阻塞事件循环
+        # 相同坐标的并发请求共享同一次查询
+        future = _inflight.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(_executor, _lookup_tz, *key)
+            _inflight[key] = future
+            future.add_done_callback(functools.partial(_on_lookup_done, key))
+
+        # shield 避免某个调用方被取消时连带取消共享的查询
+        return await asyncio.shield(future)
 
     except Exception as e:
         logger.error(f"获取时区时发生错误: {e}", exc_info=True)
@@ -35,7 +106,7 @@ async def get_timezone_from_location(latitude: float, longitude: float) -> str:
 
 async def save_user_location(
     user_id: int, latitude: float, longitude: float, timezone: Optional[str] = None
-) -> bool:
+) -> Optional[Dict[str, Any]]:
     """保存用户位置信息到数据库
 
     Args:
@@ -45,13 +116,13 @@ async def save_user_location(
         timezone: 时区（可选，如果不提供则自动获取）
 
     Returns:
-        是否保存成功
+        保存后的位置信息字典，如果保存失败则返回 None
     """
     try:
         return await profiles.save_user_location(user_id, latitude, longitude, timezone)
     except Exception as e:
         logger.error(f"保存用户位置信息时发生错误: {e}", exc_info=True)
-        return False
+        return None
 
 
 async def get_user_location(user_id: int) -> Optional[Dict[str, Any]]:
@@ -10,12 +10,11 @@ from aiogram.fsm.context import FSMContext
 from aiogram.types import FSInputFile, Message, ReplyKeyboardRemove
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 from langchain_core.messages import AIMessage, HumanMessage
-from telegramify_markdown import markdownify
 
 from src.agent.graph import get_compiled_graph
 from src.agent.state import SupervisorState
 from src.auth.service import (
-    check_group_authorized,
+    check_group_access,
     check_private_authorization,
     check_user_role_in_group,
 )
@@ -33,7 +32,7 @@ from src.bot.filters import (
 )
 from src.bot.location_service import get_timezone_from_location, save_user_location
 from src.bot.states import LocationStates
-from src.utils.langchain_utils import limit_messages
+from src.utils.markdown_utils import to_telegram_markdown
 from src.utils.settings import project_root, setting
 
 logger = logging.getLogger(__name__)
@@ -96,17 +95,83 @@ class TimezoneSelect(CallbackData, prefix="tz_sel"):
     zone: str
 
 
+# 时区 -> 国家信息映射
+_ZONE_TO_COUNTRY = {country["zone"]: country for country in FEATURED_COUNTRIES}
+
+
+def _build_country_keyboard_markup() -> types.InlineKeyboardMarkup:
+    """构建国家选择内联键盘"""
+    builder = InlineKeyboardBuilder()
+    for country in FEATURED_COUNTRIES:
+        builder.button(
+            text=country["label"],
+            callback_data=TimezoneSelect(zone=country["zone"]),
+        )
+    builder.adjust(2)
+    return builder.as_markup()
+
+
+# 国家选择键盘内容固定，启动时构建一次
+_COUNTRY_KEYBOARD_MARKUP = _build_country_keyboard_markup()
+
+# 地区选择图片，首次发送后缓存 Telegram 返回的 file_id，之后无需重复上传
+_LOCATION_SELECT_IMAGE = project_root / "resources" / "images" / "location-select.jpg"
+_LOCATION_SELECT_FILE_ID: Optional[str] = None
+
+
+def _utf16_length(text: str) -> int:
+    """计算文本的 UTF-16 码元数（Telegram 按 UTF-16 码元计算消息长度）"""
+    # 纯 ASCII 文本的码元数等于字符数，无需编码
+    if text.isascii():
+        return len(text)
+    return len(text.encode("utf-16-le")) // 2
+
+
+def _truncate_message(text: str, max_length: int) -> str:
+    """按 UTF-16 码元截断纯文本消息，超长时以 ... 结尾"""
+    # 每个字符最多占 2 个 UTF-16 码元，此时无需编码即可确定未超限
+    if len(text) * 2 <= max_length:
+        return text
+
+    encoded = text.encode("utf-16-le")
+    if len(encoded) // 2 <= max_length:
+        return text
+
+    # 截断处可能切开代理对，忽略残缺的半个字符
+    truncated = encoded[: (max_length - 3) * 2].decode("utf-16-le", errors="ignore")
+    return truncated + "..."
+
+
+def _to_reply_markdown(text: str, max_length: int) -> str:
+    """将回复转换为 MarkdownV2，并保证结果不超过 max_length 个 UTF-16 码元
+
+    在转换前截断原文，截断处不会落在转义序列或未闭合的格式标记中间，
+    结尾的 ... 也会被正确转义。转义会增加长度，超限时按转换后的长度比例继续缩减原文。
+    """
+    result = to_telegram_markdown(text)
+    length = _utf16_length(result)
+    budget = _utf16_length(text)
+    while length > max_length and budget > 3:
+        budget = max(3, min(budget - 1, budget * max_length // length))
+        result = to_telegram_markdown(_truncate_message(text, budget))
+        length = _utf16_length(result)
+    return result
+
+
 async def handle_chat(message: Message) -> None:
     """处理聊天消息，调用 AI 生成回复"""
     try:
-        if not message.from_user:
+        user = message.from_user
+        if not user:
             return
 
-        user_id = message.from_user.id
-        chat_type = "private" if message.chat.type == "private" else "group"
+        chat = message.chat
+        bot = message.bot
+        user_id = user.id
+        chat_type = "private" if chat.type == "private" else "group"
 
         # 群组ID：群聊时为群组ID，私聊时为None
-        group_id = message.chat.id if chat_type == "group" else None
+        group_id = chat.id if chat_type == "group" else None
 
         # 消息目标ID：私聊时为user_id，群聊时为group_id
         chat_id = user_id if chat_type == "private" else group_id
@@ -116,7 +181,7 @@ async def handle_chat(message: Message) -> None:
         chat_type_context.set(chat_type)
         group_id_context.set(group_id)
         chat_id_context.set(chat_id)
-        bot_instance.set(message.bot)
+        bot_instance.set(bot)
 
         user_message = message.text or message.caption or ""
 
@@ -131,7 +196,7 @@ async def handle_chat(message: Message) -> None:
 
         # 显示"正在输入"状态
         if setting.ENABLE_TYPING_ACTION:
-            await message.bot.send_chat_action(chat_id=message.chat.id, action="typing")
+            await bot.send_chat_action(chat_id=chat.id, action="typing")
 
         # 获取或创建 Agent Graph
         graph, config = await get_compiled_graph(user_id, chat_type, group_id)
@@ -151,27 +216,22 @@ async def handle_chat(message: Message) -> None:
         # 调用 Agent 生成回复
         result = await graph.ainvoke(initial_state, config=config)
 
-        # 确保返回的状态中的消息不超过限制（防止从 checkpointer 恢复的旧状态超过限制）
-        if len(result["messages"]) > setting.MAX_MESSAGES_IN_STATE:
-            result["messages"] = limit_messages(
-                result["messages"], setting.MAX_MESSAGES_IN_STATE
-            )
-
-        # 获取最后一条 AI 消息
-        ai_messages = [msg for msg in result["messages"] if isinstance(msg, AIMessage)]
-        if not ai_messages:
+        # 从后往前查找最后一条 AI 消息
+        last_ai_message = next(
+            (msg for msg in reversed(result["messages"]) if isinstance(msg, AIMessage)),
+            None,
+        )
+        if last_ai_message is None:
             await message.answer("抱歉，无法生成回复。")
             return
 
         # 获取回复内容
-        reply_content = ai_messages[-1].content
-
-        # 将标准 Markdown 转换为 Telegram MarkdownV2 格式
-        reply_content = markdownify(str(reply_content))
+        reply_content = last_ai_message.content
+        if not isinstance(reply_content, str):
+            reply_content = str(reply_content)
 
-        # 检查消息长度
-        if len(reply_content) > setting.MAX_MESSAGE_LENGTH:
-            reply_content = reply_content[: setting.MAX_MESSAGE_LENGTH - 3] + "..."
+        # 将标准 Markdown 转换为 Telegram MarkdownV2 格式，超长时先截断原文再转换
+        reply_content = _to_reply_markdown(reply_content, setting.MAX_MESSAGE_LENGTH)
 
         # 发送回复（使用 MarkdownV2 格式）
         await message.answer(reply_content, parse_mode="MarkdownV2")
@@ -192,12 +252,14 @@ async def finalize_location_setup(
 ):
     """保存位置信息并通知用户"""
     try:
-        await save_user_location(user_id, lat, lon, tz)
+        profile = await save_user_location(user_id, lat, lon, tz)
+        if profile is None:
+            raise RuntimeError(f"用户 {user_id} 的位置信息保存失败")
 
         text = (
             f"✅ 位置信息已保存！\n\n"
-            f"📍 位置：纬度 {lat:.6f}, 经度 {lon:.6f}\n"
-            f"🕐 时区：{tz}"
+            f"📍 位置：纬度 {profile['latitude']:.6f}, 经度 {profile['longitude']:.6f}\n"
+            f"🕐 时区：{profile['timezone']}"
         )
 
         if isinstance(event, types.Message):
@@ -229,9 +291,7 @@ async def handle_timezone_selection(
     await state.clear()
 
     # 从 FEATURED_COUNTRIES 中匹配经纬度
-    selected = next(
-        (c for c in FEATURED_COUNTRIES if c["zone"] == callback_data.zone), None
-    )
+    selected = _ZONE_TO_COUNTRY.get(callback_data.zone)
 
     if selected:
         await finalize_location_setup(
@@ -252,6 +312,7 @@ async def handle_timezone_selection(
 @router.message(LocationStates.waiting_for_location)
 async def handle_location_message(message: Message, state: FSMContext):
     """处理位置消息或拒绝位置请求"""
+    global _LOCATION_SELECT_FILE_ID
 
     # 处理拒绝
     if message.text == "🚫 我拒绝!":
@@ -265,30 +326,23 @@ async def handle_location_message(message: Message, state: FSMContext):
     # 处理手动选择
     if message.text == "🌍 手动选择":
         # 注意：这里不需要 clear state，因为用户还没选完
-        builder = InlineKeyboardBuilder()
-        for country in FEATURED_COUNTRIES:
-            builder.button(
-                text=country["label"],
-                callback_data=TimezoneSelect(zone=country["zone"]),
-            )
-        builder.adjust(2)
-
         await message.answer(
             "🌏 *跨越山海，只为精准陪伴*",
             parse_mode="Markdown",
             reply_markup=ReplyKeyboardRemove(),
         )
 
-        # 使用本地文件路径发送图片和内联键盘
-        image_path = project_root / "resources" / "images" / "location-select.jpg"
-        photo = FSInputFile(str(image_path))
+        # 优先使用 Telegram 已缓存的 file_id，首次发送时上传本地图片
+        photo = _LOCATION_SELECT_FILE_ID or FSInputFile(str(_LOCATION_SELECT_IMAGE))
 
-        await message.answer_photo(
+        sent = await message.answer_photo(
             photo=photo,
             caption="在下方选择您所在的区域：",
             parse_mode="Markdown",
-            reply_markup=builder.as_markup(),
+            reply_markup=_COUNTRY_KEYBOARD_MARKUP,
         )
+        if _LOCATION_SELECT_FILE_ID is None and sent.photo:
+            _LOCATION_SELECT_FILE_ID = sent.photo[-1].file_id
         return
 
     # 处理自动发送的位置
@@ -317,8 +371,11 @@ async def handle_location_message(message: Message, state: FSMContext):
 @router.message(not_command_filter)
 async def handle_message(message: Message):
     """处理非命令消息（AI 对话）"""
-    chat_type = "private" if message.chat.type == "private" else "group"
-    user_id = message.from_user.id if message.from_user else None
+    chat = message.chat
+    user = message.from_user
+    bot = message.bot
+    chat_type = "private" if chat.type == "private" else "group"
+    user_id = user.id if user else None
 
     if not user_id:
         return
@@ -334,14 +391,15 @@ async def handle_message(message: Message):
 
     # 群组处理流程
     else:
-        group_id = message.chat.id
-        is_group_authorized = await check_group_authorized(group_id)
-        if not is_group_authorized:
+        group_id = chat.id
+        # 一次查询取得群组授权及用户身份所需的数据，后续身份判定直接命中缓存
+        access = await check_group_access(group_id, user_id)
+        if not access.group_authorized:
             try:
                 await message.answer(
                     f"本群 {group_id} 未获授权，机器人将退出。", parse_mode=None
                 )
-                await message.bot.leave_chat(group_id)
+                await bot.leave_chat(group_id)
             except TelegramForbiddenError:
                 logger.debug("机器人已不在群组中")
             except Exception as e:
@@ -349,14 +407,14 @@ async def handle_message(message: Message):
             return
 
         # 检查是否 @ 机器人或回复机器人
-        is_mention = await group_mention_filter(message, bot=message.bot)
-        is_reply = await reply_to_bot_filter(message, bot=message.bot)
+        is_mention = await group_mention_filter(message, bot=bot)
+        is_reply = await reply_to_bot_filter(message, bot=bot)
 
         if not (is_mention or is_reply):
             return
 
         # 用户身份判定
-        user_role = await check_user_role_in_group(message.bot, group_id, user_id)
+        user_role = await check_user_role_in_group(bot, group_id, user_id)
         if user_role == "unauthorized":
             await message.answer("您未获本群授权")
             return
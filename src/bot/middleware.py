@@ -1,6 +1,7 @@
 """Bot 中间件"""
 
 import logging
+import re
 from typing import Any, Awaitable, Callable, Dict
 
 from aiogram import BaseMiddleware
@@ -8,6 +9,21 @@ from aiogram.types import Message, TelegramObject
 
 logger = logging.getLogger(__name__)
 
+# 错误关键词匹配，避免对较长的异常信息整体调用 lower()
+_ERROR_KEYWORD_RE = re.compile(
+    r"database|connection|api|openai|network|timeout", re.IGNORECASE
+)
+
+# 错误关键词 -> 提示信息
+_ERROR_KEYWORD_MESSAGES = {
+    "database": "服务暂时不可用，请稍后重试",
+    "connection": "服务暂时不可用，请稍后重试",
+    "api": "AI 服务暂时不可用，请稍后重试",
+    "openai": "AI 服务暂时不可用，请稍后重试",
+    "network": "网络连接出现问题，请稍后重试",
+    "timeout": "网络连接出现问题，请稍后重试",
+}
+
 
 class LoggingMiddleware(BaseMiddleware):
     """日志中间件"""
@@ -48,22 +64,11 @@ class ErrorHandlingMiddleware(BaseMiddleware):
             # 如果是消息事件，尝试发送错误提示
             if isinstance(event, Message):
                 try:
-                    error_messages = {
-                        "数据库": "服务暂时不可用，请稍后重试",
-                        "API": "AI 服务暂时不可用，请稍后重试",
-                        "网络": "网络连接出现问题，请稍后重试",
-                    }
-
                     # 根据错误类型返回不同的提示
                     error_msg = "发生未知错误，请联系管理员"
-                    error_str = str(e).lower()
-
-                    if "database" in error_str or "connection" in error_str:
-                        error_msg = error_messages["数据库"]
-                    elif "api" in error_str or "openai" in error_str:
-                        error_msg = error_messages["API"]
-                    elif "network" in error_str or "timeout" in error_str:
-                        error_msg = error_messages["网络"]
+                    match = _ERROR_KEYWORD_RE.search(str(e))
+                    if match:
+                        error_msg = _ERROR_KEYWORD_MESSAGES[match.group(0).lower()]
 
                     await event.answer(error_msg)
                 except Exception:
@@ -3,17 +3,62 @@
 使用 APScheduler 管理定时任务的调度和执行。
 """
 
+import asyncio
 import logging
+import time
 from datetime import datetime, timezone
 
 from aiogram import Bot
+from apscheduler.executors.asyncio import AsyncIOExecutor
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from telegramify_markdown import markdownify
 
 from src.database.repositories import scheduled_tasks as task_repo
+from src.utils.markdown_utils import to_telegram_markdown
 
 logger = logging.getLogger(__name__)
 
+# 调度器任务默认配置：
+# - coalesce: 错过的多次执行合并为一次
+# - misfire_grace_time: 重启等原因错过执行时间后，5 分钟内仍会补发
+# - max_instances: 同一任务同时只运行一个实例
+_JOB_DEFAULTS = {"coalesce": True, "misfire_grace_time": 300, "max_instances": 1}
+
+# Telegram 限制单个 Bot 每秒最多发送约 30 条消息
+_SEND_RATE_LIMIT = 30
+
+
+class _RateLimiter:
+    """令牌桶限流器，平滑大量任务同时到期时的发送峰值"""
+
+    def __init__(self, rate: float, period: float = 1.0) -> None:
+        self._rate = rate
+        self._period = period
+        self._tokens = rate
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def __aenter__(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                elapsed = now - self._updated_at
+                self._tokens = min(
+                    self._rate, self._tokens + elapsed * self._rate / self._period
+                )
+                self._updated_at = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self._tokens) * self._period / self._rate)
+
+    async def __aexit__(self, *exc_info) -> None:
+        return None
+
+
+_send_limiter = _RateLimiter(_SEND_RATE_LIMIT)
+
 
 class SchedulerService:
     """定时任务调度服务（单例）
@@ -45,7 +90,10 @@ class SchedulerService:
             return
 
         self._bot = bot
-        self._scheduler = AsyncIOScheduler()
+        self._scheduler = AsyncIOScheduler(
+            executors={"default": AsyncIOExecutor()},
+            job_defaults=_JOB_DEFAULTS,
+        )
         self._scheduler.start()
         self._initialized = True
 
@@ -118,25 +166,30 @@ class SchedulerService:
 
     async def _load_pending_tasks(self) -> None:
         """系统启动时，从数据库加载未执行且时间在未来的任务"""
+        if not self._scheduler:
+            return
+
+        # 批量添加期间暂停调度器，避免每添加一个任务都唤醒一次调度循环
+        self._scheduler.pause()
         try:
-            tasks = await task_repo.get_pending_tasks()
             loaded_count = 0
 
-            for task in tasks:
-                if self._scheduler:
-                    self._scheduler.add_job(
-                        self._execute_task,
-                        "date",
-                        run_date=task.execute_at,
-                        args=[task.id],
-                        id=f"task_{task.id}",
-                        replace_existing=True,
-                    )
-                    loaded_count += 1
+            async for task in task_repo.iter_pending_tasks():
+                self._scheduler.add_job(
+                    self._execute_task,
+                    "date",
+                    run_date=task.execute_at,
+                    args=[task.id],
+                    id=f"task_{task.id}",
+                    replace_existing=True,
+                )
+                loaded_count += 1
 
             logger.info(f"从数据库恢复了 {loaded_count} 个待执行任务")
         except Exception as e:
             logger.error(f"加载待执行任务失败: {e}", exc_info=True)
+        finally:
+            self._scheduler.resume()
 
     async def _execute_task(self, task_id: int) -> None:
         """任务执行回调
@@ -147,28 +200,24 @@ class SchedulerService:
             task_id: 任务 ID
         """
         try:
-            # 从数据库获取任务详情
-            task = await task_repo.get_task_by_id(task_id)
+            # 领取任务（同时标记为已执行），一次查询完成检查与状态更新
+            # TODO:即使发送失败，也标记为已执行，避免重复发送，考虑后续添加重试机制
+            task = await task_repo.claim_task(task_id)
             if not task:
-                logger.warning(f"任务不存在: task_id={task_id}")
-                return
-
-            if task.is_executed:
-                logger.warning(f"任务已执行，跳过: task_id={task_id}")
+                logger.warning(f"任务不存在或已执行，跳过: task_id={task_id}")
                 return
 
             # 发送提醒消息
             if self._bot:
-                formatted_text = markdownify(task.content)
+                formatted_text = to_telegram_markdown(task.content)
 
-                await self._bot.send_message(
-                    chat_id=task.chat_id,
-                    text=formatted_text,
-                )
-                # TODO:即使发送失败，也标记为已执行，避免重复发送，考虑后续添加重试机制
+                async with _send_limiter:
+                    await self._bot.send_message(
+                        chat_id=task.chat_id,
+                        text=formatted_text,
+                        parse_mode="MarkdownV2",
+                    )
 
-            # 更新任务状态
-            await task_repo.mark_task_as_executed(task_id)
             logger.info(f"提醒消息已发送: task_id={task_id}, chat_id={task.chat_id}")
 
         except Exception as e:
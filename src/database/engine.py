@@ -4,8 +4,11 @@
 LangGraph 相关操作仍使用 langgraph_pool.py 中的 psycopg 连接池。
 """
 
+import functools
+import threading
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator
+from uuid import uuid4
 
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
@@ -20,7 +23,20 @@ from src.utils.settings import get_db_config
 _engine: AsyncEngine | None = None
 _session_factory: async_sessionmaker[AsyncSession] | None = None
 
+# 仅在首次创建实例时使用，避免并发创建多个实例
+_init_lock = threading.Lock()
 
+# 服务端 TCP keepalive 参数：只作用于服务端 socket，由服务端定期探测，
+# 使其及时清理客户端已断开的连接，同时保持 NAT/防火墙上的空闲连接映射。
+# 客户端发现断开的连接依赖 pool_pre_ping、pool_recycle 和 command_timeout
+_TCP_KEEPALIVE_SETTINGS = {
+    "tcp_keepalives_idle": "30",
+    "tcp_keepalives_interval": "10",
+    "tcp_keepalives_count": "3",
+}
+
+
+@functools.lru_cache(maxsize=1)
 def _build_async_connection_string() -> str:
     """构建 SQLAlchemy 异步连接字符串"""
     config = get_db_config()
@@ -30,18 +46,71 @@ def _build_async_connection_string() -> str:
     )
 
 
+def _pgbouncer_statement_name() -> str:
+    """生成唯一的预处理语句名，避免不同后端连接上的同名语句冲突"""
+    return f"__asyncpg_{uuid4()}__"
+
+
+def _build_connect_args(config: dict[str, Any]) -> dict[str, Any]:
+    """构建 asyncpg 连接参数"""
+    connect_args: dict[str, Any] = {
+        "timeout": config["connect_timeout"],
+        "command_timeout": config["command_timeout"],
+    }
+
+    if config["use_pgbouncer"]:
+        # PgBouncer 事务模式下后端连接不固定，预处理语句无法复用：
+        # 关闭语句缓存，并为每条语句生成唯一名称
+        connect_args["statement_cache_size"] = 0
+        connect_args["prepared_statement_cache_size"] = 0
+        connect_args["prepared_statement_name_func"] = _pgbouncer_statement_name
+        # PgBouncer 会拒绝未在 ignore_startup_parameters 中声明的启动参数，
+        # 因此不发送 server_settings（jit 等参数可在数据库或角色级别配置）
+        return connect_args
+
+    # 缓存预处理语句，重复查询时跳过解析和生成计划
+    connect_args["statement_cache_size"] = config["statement_cache_size"]
+    connect_args["prepared_statement_cache_size"] = config["statement_cache_size"]
+
+    server_settings = dict(_TCP_KEEPALIVE_SETTINGS)
+    if config["disable_jit"]:
+        server_settings["jit"] = "off"
+    connect_args["server_settings"] = server_settings
+    return connect_args
+
+
 def get_engine() -> AsyncEngine:
     """获取 SQLAlchemy 异步引擎（单例）"""
     global _engine
 
-    if _engine is None:
-        connection_string = _build_async_connection_string()
-        _engine = create_async_engine(
-            connection_string,
-            echo=False,  # 生产环境关闭 SQL 日志
-            pool_size=10,
-            max_overflow=20,
-        )
+    if _engine is not None:
+        return _engine
+
+    with _init_lock:
+        # 等待锁期间可能已被其他线程创建
+        if _engine is None:
+            config = get_db_config()
+            # PgBouncer 事务模式下 pre-ping 会留下 idle in transaction 的后端连接，
+            # 此时依赖连接超时发现断开的连接
+            pre_ping = config["pool_pre_ping"] and not config["use_pgbouncer"]
+            connection_string = _build_async_connection_string()
+            _engine = create_async_engine(
+                connection_string,
+                echo=False,  # 生产环境关闭 SQL 日志
+                # 编译语句缓存，默认 500 条，调大以减少缓存淘汰后的重复编译
+                query_cache_size=config["query_cache_size"],
+                # 关闭 FROM 子句笛卡尔积检查，省去每次编译时的额外遍历
+                enable_from_linting=False,
+                pool_size=config["pool_size"],
+                max_overflow=config["max_overflow"],
+                pool_pre_ping=pre_ping,  # 取出连接前检测，避免使用已断开的连接
+                pool_recycle=config["pool_recycle"],
+                # get_session 总会提交或回滚事务，归还连接时无需再发送 ROLLBACK
+                pool_reset_on_return=(
+                    "rollback" if config["rollback_on_return"] else None
+                ),
+                connect_args=_build_connect_args(config),
+            )
 
     return _engine
 
@@ -50,13 +119,17 @@ def get_session_factory() -> async_sessionmaker[AsyncSession]:
     """获取会话工厂（单例）"""
     global _session_factory
 
-    if _session_factory is None:
-        engine = get_engine()
-        _session_factory = async_sessionmaker(
-            engine,
-            class_=AsyncSession,
-            expire_on_commit=False,
-        )
+    if _session_factory is not None:
+        return _session_factory
+
+    engine = get_engine()
+    with _init_lock:
+        if _session_factory is None:
+            _session_factory = async_sessionmaker(
+                engine,
+                class_=AsyncSession,
+                expire_on_commit=False,
+            )
 
     return _session_factory
 
@@ -89,3 +162,7 @@ async def close_engine() -> None:
         await _engine.dispose()
         _engine = None
         _session_factory = None
+
+    # 清除缓存的配置，下次创建引擎时重新读取
+    _build_async_connection_string.cache_clear()
+    get_db_config.cache_clear()
@@ -1,43 +1,79 @@
 """数据库初始化脚本"""
 
+import asyncio
 import sys
 
-from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
-from langgraph.store.postgres.aio import AsyncPostgresStore
-from sqlalchemy import select
+from sqlalchemy import (
+    BigInteger,
+    cast,
+    column,
+    exists,
+    insert,
+    inspect,
+    literal,
+    null,
+    select,
+    text,
+    values,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.engine import Connection
 
 # 导入 settings 以初始化环境变量和路径
 import src.utils.settings  # noqa: F401
 from src.database.engine import get_engine, get_session
-from src.database.langgraph_pool import create_pool
+from src.database.langgraph import get_checkpointer, get_store
 from src.database.models import Base, UserPermissionModel, WhitelistEntryModel
+from src.database.repositories.auth import preload_super_admins
 from src.utils.logger import setup_logger
-from src.utils.settings import get_embeddings, get_index_config, setting
+from src.utils.settings import setting
 
 logger = setup_logger()
 
 
-async def _init_langgraph_tables(pool) -> None:
+# 已有数据库的结构升级语句（需保证可重复执行）
+# 建表只会创建缺失的表，不会调整已存在表的索引
+_SCHEMA_UPGRADES = [
+    # 定时任务待执行索引改为 (execute_at, id) 部分索引，支持键集分页和仅索引扫描，
+    # 同时移除索引全部行的 is_executed 单列索引
+    "DROP INDEX IF EXISTS idx_scheduled_tasks_pending",
+    "DROP INDEX IF EXISTS ix_scheduled_tasks_is_executed",
+    "CREATE INDEX IF NOT EXISTS idx_scheduled_tasks_pending_keyset "
+    "ON scheduled_tasks (execute_at, id) WHERE is_executed = false",
+    # 移除与主键/唯一约束重复的索引
+    "DROP INDEX IF EXISTS idx_user_profiles_user_id",
+    "DROP INDEX IF EXISTS idx_authorized_groups_group_id",
+    "DROP INDEX IF EXISTS idx_whitelist_user_id",
+    # 移除被复合索引前缀列覆盖的索引
+    "DROP INDEX IF EXISTS ix_scheduled_tasks_user_id",
+]
+
+
+async def _init_langgraph_tables() -> None:
     """初始化 LangGraph 相关表结构
 
     包括：
     - AsyncPostgresSaver (对话记忆/checkpointer) 所需的表
     - AsyncPostgresStore (长期记忆/向量存储) 所需的表
 
-    Args:
-        pool: psycopg 数据库连接池
+    直接使用运行时的单例实例执行 setup，避免为初始化额外创建实例
     """
-    # 初始化 checkpointer 表
-    logger.info("初始化 LangGraph Checkpointer 表...")
-    checkpointer = AsyncPostgresSaver(pool)
-    await checkpointer.setup()
+    checkpointer = await get_checkpointer()
+    store = await get_store()
 
-    # 初始化 store 表
-    logger.info("初始化 LangGraph Store 表...")
-    embeddings = get_embeddings()
-    index_config = get_index_config(embeddings)
-    store = AsyncPostgresStore(pool, index=index_config)
-    await store.setup()
+    # 两者的表结构互不依赖，并发初始化以减少启动耗时
+    logger.info("初始化 LangGraph Checkpointer 和 Store 表...")
+    await asyncio.gather(checkpointer.setup(), store.setup())
+
+
+def _parse_admin_ids(raw: str) -> list[int]:
+    """解析逗号分隔的超管用户 ID，忽略非法值并去重（保持原有顺序）"""
+    admin_ids: dict[int, None] = {}
+    for part in raw.split(","):
+        uid = part.strip()
+        if uid.isdigit():
+            admin_ids[int(uid)] = None
+    return list(admin_ids)
 
 
 async def _init_super_admins() -> None:
@@ -47,12 +83,7 @@ async def _init_super_admins() -> None:
         logger.warning("INITIAL_SUPER_ADMINS 环境变量未设置，跳过超管初始化")
         return
 
-    admin_ids = [
-        int(uid.strip())
-        for uid in initial_admins.split(",")
-        if uid.strip() and uid.strip().isdigit()
-    ]
-
+    admin_ids = _parse_admin_ids(initial_admins)
     if not admin_ids:
         logger.warning("INITIAL_SUPER_ADMINS 环境变量为空或格式错误，跳过超管初始化")
         return
@@ -60,33 +91,48 @@ async def _init_super_admins() -> None:
     logger.info(f"初始化 {len(admin_ids)} 个超管用户...")
 
     async with get_session() as session:
-        for user_id in admin_ids:
-            # 检查并插入超管权限
-            stmt = select(UserPermissionModel).where(
-                UserPermissionModel.user_id == user_id
-            )
-            result = await session.execute(stmt)
-            if result.scalar_one_or_none() is None:
-                permission = UserPermissionModel(user_id=user_id, role="super_admin")
-                session.add(permission)
-
-            # 检查并插入私聊白名单
-            stmt = select(WhitelistEntryModel).where(
-                WhitelistEntryModel.user_id == user_id,
-                WhitelistEntryModel.chat_type == "private",
-                WhitelistEntryModel.group_id.is_(None),
-            )
-            result = await session.execute(stmt)
-            if result.scalar_one_or_none() is None:
-                whitelist_entry = WhitelistEntryModel(
-                    user_id=user_id,
-                    chat_type="private",
-                    group_id=None,
-                    created_by=user_id,
+        # 批量插入超管权限，已存在的跳过
+        perm_stmt = (
+            pg_insert(UserPermissionModel)
+            .values([{"user_id": uid, "role": "super_admin"} for uid in admin_ids])
+            .on_conflict_do_nothing(index_elements=["user_id"])
+        )
+        await session.execute(perm_stmt)
+
+        # 批量插入私聊白名单，已存在的跳过
+        # 注意：唯一约束中 group_id 为 NULL 时不会冲突，不能依赖 ON CONFLICT 去重
+        admins = values(column("user_id", BigInteger), name="admins").data(
+            [(uid,) for uid in admin_ids]
+        )
+        whitelist_stmt = insert(WhitelistEntryModel).from_select(
+            ["user_id", "chat_type", "group_id", "created_by"],
+            select(
+                admins.c.user_id,
+                literal("private"),
+                cast(null(), BigInteger),
+                admins.c.user_id,
+            ).where(
+                ~exists().where(
+                    WhitelistEntryModel.user_id == admins.c.user_id,
+                    WhitelistEntryModel.chat_type == "private",
+                    WhitelistEntryModel.group_id.is_(None),
                 )
-                session.add(whitelist_entry)
+            ),
+        )
+        await session.execute(whitelist_stmt)
+
+    logger.info(f"超管用户初始化完成: {admin_ids}")
 
-            logger.info(f"超管用户 {user_id} 初始化完成")
+
+def _create_missing_tables(conn: Connection) -> None:
+    """一次性查询已存在的表，只为缺失的表执行建表语句
+
+    create_all 默认会逐表查询是否存在，这里合并为一次查询
+    """
+    existing = set(inspect(conn).get_table_names())
+    missing = [t for t in Base.metadata.sorted_tables if t.name not in existing]
+    if missing:
+        Base.metadata.create_all(conn, tables=missing, checkfirst=False)
 
 
 async def init_database() -> None:
@@ -94,12 +140,17 @@ async def init_database() -> None:
     try:
         engine = get_engine()
         async with engine.begin() as conn:
-            await conn.run_sync(Base.metadata.create_all)
+            await conn.run_sync(_create_missing_tables)
+            for statement in _SCHEMA_UPGRADES:
+                await conn.execute(text(statement))
 
         await _init_super_admins()
 
-        pool = await create_pool()
-        await _init_langgraph_tables(pool)
+        # 预热超管缓存
+        count = await preload_super_admins()
+        logger.info(f"已预热 {count} 个超管的权限缓存")
+
+        await _init_langgraph_tables()
 
     except Exception as e:
         logger.error(f"数据库初始化失败: {e}", exc_info=True)
@@ -1,5 +1,7 @@
 """AsyncPostgresSaver 初始化（对话记忆）"""
 
+import asyncio
+
 from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
 
 from src.database.langgraph_pool import get_pool
@@ -7,6 +9,9 @@ from src.database.langgraph_pool import get_pool
 # 单例 checkpointer 实例
 _checkpointer_instance: AsyncPostgresSaver | None = None
 
+# 仅在首次创建实例时使用，避免并发创建多个实例
+_init_lock = asyncio.Lock()
+
 
 async def get_checkpointer() -> AsyncPostgresSaver:
     """获取 AsyncPostgresSaver 单例实例（对话记忆）"""
@@ -16,8 +21,10 @@ async def get_checkpointer() -> AsyncPostgresSaver:
     if _checkpointer_instance is not None:
         return _checkpointer_instance
 
-    # 创建新实例
-    pool = await get_pool()
-    _checkpointer_instance = AsyncPostgresSaver(pool)
+    async with _init_lock:
+        # 等待锁期间可能已被其他协程创建
+        if _checkpointer_instance is None:
+            pool = await get_pool()
+            _checkpointer_instance = AsyncPostgresSaver(pool)
 
     return _checkpointer_instance
@@ -1,5 +1,7 @@
 """AsyncPostgresStore 初始化（长期记忆）"""
 
+import asyncio
+
 from langgraph.store.postgres.aio import AsyncPostgresStore
 
 from src.database.langgraph_pool import get_pool
@@ -8,6 +10,9 @@ from src.utils.settings import get_embeddings, get_index_config
 # 单例 store 实例
 _store_instance: AsyncPostgresStore | None = None
 
+# 仅在首次创建实例时使用，避免并发创建多个实例
+_init_lock = asyncio.Lock()
+
 
 async def get_store() -> AsyncPostgresStore:
     """获取 AsyncPostgresStore 单例实例"""
@@ -17,10 +22,12 @@ async def get_store() -> AsyncPostgresStore:
     if _store_instance is not None:
         return _store_instance
 
-    # 创建新实例
-    pool = await get_pool()
-    embeddings = get_embeddings()
-    index_config = get_index_config(embeddings)
-    _store_instance = AsyncPostgresStore(pool, index=index_config)
+    async with _init_lock:
+        # 等待锁期间可能已被其他协程创建
+        if _store_instance is None:
+            pool = await get_pool()
+            embeddings = get_embeddings()
+            index_config = get_index_config(embeddings)
+            _store_instance = AsyncPostgresStore(pool, index=index_config)
 
     return _store_instance
@@ -5,15 +5,31 @@ LangGraph 要求使用 `psycopg_pool.AsyncConnectionPool` 不兼容 SQLAlchemy
 
 """
 
-from psycopg import AsyncConnection
+import asyncio
+import functools
+import time
+
 from psycopg_pool import AsyncConnectionPool
 
-from src.utils.settings import get_db_config
+from src.utils.settings import get_db_config, setting
 
 # 全局连接池以支持 LangGraph
 _pool: AsyncConnectionPool | None = None
 
+# 新建连接时直接传入的连接参数：
+# - autocommit: LangGraph 要求连接处于自动提交模式
+# - prepare_threshold: 同一语句执行超过 3 次后在服务端 PREPARE，之后跳过解析和生成计划
+_CONNECTION_KWARGS = {"autocommit": True, "prepare_threshold": 3}
+
+# 仅在首次创建连接池时使用，避免并发创建多个连接池
+_pool_lock = asyncio.Lock()
+
+# 健康检查结果缓存：上次检查成功后 5 秒内直接返回成功，不再访问数据库
+_HEALTH_CHECK_TTL = 5.0
+_last_ok_at: float = 0.0
+
 
+@functools.lru_cache(maxsize=1)
 def _build_connection_string() -> str:
     """构建 psycopg 数据库连接字符串"""
     config = get_db_config()
@@ -23,25 +39,40 @@ def _build_connection_string() -> str:
     )
 
 
-async def _configure_connection(conn: AsyncConnection) -> None:
-    """配置连接回调，设置 autocommit"""
-    await conn.set_autocommit(True)
-
-
 async def create_pool() -> AsyncConnectionPool:
     """创建 LangGraph 专用连接池"""
     global _pool
 
-    if _pool is None:
-        connection_string = _build_connection_string()
-        _pool = AsyncConnectionPool(
-            conninfo=connection_string,
-            min_size=2,
-            max_size=20,
-            configure=_configure_connection,
-            open=False,
-        )
-        await _pool.open()
+    if _pool is not None:
+        return _pool
+
+    async with _pool_lock:
+        # 等待锁期间可能已被其他协程创建
+        if _pool is None:
+            connection_string = _build_connection_string()
+            max_size = setting.POSTGRES_POOL_MAX
+            min_size = setting.POSTGRES_POOL_MIN
+            if min_size is None:
+                min_size = max_size // 2
+            kwargs = _CONNECTION_KWARGS
+            if setting.POSTGRES_USE_PGBOUNCER:
+                # PgBouncer 事务模式下后端连接不固定，不使用服务端预处理语句
+                kwargs = {**_CONNECTION_KWARGS, "prepare_threshold": None}
+            pool = AsyncConnectionPool(
+                conninfo=connection_string,
+                min_size=min_size,
+                max_size=max_size,
+                timeout=setting.POSTGRES_POOL_TIMEOUT,  # 获取连接超时快速失败
+                max_waiting=1000,
+                max_idle=300,
+                # 连接长期复用，保留 prepare_threshold 积累的服务端预处理语句
+                max_lifetime=setting.POSTGRES_POOL_MAX_LIFETIME,
+                kwargs=kwargs,
+                open=False,
+            )
+            await pool.open()
+            # 打开后再赋值，避免其他协程拿到未打开的连接池
+            _pool = pool
 
     return _pool
 
@@ -55,21 +86,35 @@ async def get_pool() -> AsyncConnectionPool:
 
 async def close_pool() -> None:
     """关闭 LangGraph 连接池"""
-    global _pool
+    global _pool, _last_ok_at
 
     if _pool is not None:
         await _pool.close()
         _pool = None
+    _last_ok_at = 0.0
+
+    # 清除缓存的配置，下次创建连接池时重新读取
+    _build_connection_string.cache_clear()
+    get_db_config.cache_clear()
 
 
 async def health_check() -> bool:
-    """检查数据库连接健康状态"""
+    """检查数据库连接健康状态
+
+    上次检查成功后的短时间内直接返回成功，避免频繁探测带来的数据库往返
+    """
+    global _last_ok_at
+
+    now = time.monotonic()
+    if now - _last_ok_at < _HEALTH_CHECK_TTL:
+        return True
+
     try:
         pool = await get_pool()
         async with pool.connection() as conn:
-            async with conn.cursor() as cur:
-                await cur.execute("SELECT 1")
-                await cur.fetchone()
+            cur = await conn.execute("SELECT 1")
+            await cur.fetchone()
+        _last_ok_at = now
         return True
     except Exception:
         return False
@@ -1,11 +1,12 @@
 """SQLAlchemy ORM 模型定义
 
 本模块定义业务表的 ORM 模型，与 src/auth/models.py 中的领域模型对应。
-每个 ORM 模型提供 to_domain() 方法转换为领域模型。
+每个 ORM 模型提供 to_domain() 方法转换为领域模型，
+列表查询可通过 domain_columns() 只查询所需列，再用 rows_to_domain() 批量转换。
 """
 
 from datetime import datetime
-from typing import TYPE_CHECKING, Optional
+from typing import Optional, Sequence
 
 from sqlalchemy import (
     BigInteger,
@@ -13,14 +14,18 @@ from sqlalchemy import (
     DateTime,
     Double,
     Index,
+    Row,
     String,
     UniqueConstraint,
     func,
+    text,
 )
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
-if TYPE_CHECKING:
-    from src.auth.models import AuthorizedGroup, UserPermission, WhitelistEntry
+from src.auth.models import AuthorizedGroup, UserPermission, UserRole, WhitelistEntry
+
+# 角色值到枚举的映射，避免每行调用 UserRole(value) 的查找开销
+_ROLE_MAP: dict[str, UserRole] = {role.value: role for role in UserRole}
 
 
 class Base(DeclarativeBase):
@@ -53,18 +58,26 @@ class UserPermissionModel(Base):
         comment="更新时间",
     )
 
-    def to_domain(self) -> "UserPermission":
+    def to_domain(self) -> UserPermission:
         """转换为领域模型"""
-        from src.auth.models import UserPermission, UserRole
-
         return UserPermission(
             id=self.id,
             user_id=self.user_id,
-            role=UserRole(self.role),
+            role=_ROLE_MAP[self.role],
             created_at=self.created_at,
             updated_at=self.updated_at,
         )
 
+    @classmethod
+    def domain_columns(cls) -> tuple:
+        """rows_to_domain() 所需的查询列（顺序与领域模型字段一致）"""
+        return (cls.id, cls.user_id, cls.role, cls.created_at, cls.updated_at)
+
+    @staticmethod
+    def rows_to_domain(rows: Sequence[Row]) -> list[UserPermission]:
+        """将 domain_columns() 查询结果批量转换为领域模型，不经过 ORM 实例化"""
+        return [UserPermission(r[0], r[1], _ROLE_MAP[r[2]], r[3], r[4]) for r in rows]
+
 
 class AuthorizedGroupModel(Base):
     """授权群组表 ORM 模型"""
@@ -88,12 +101,8 @@ class AuthorizedGroupModel(Base):
         Boolean, default=True, nullable=False, comment="是否启用"
     )
 
-    __table_args__ = (Index("idx_authorized_groups_group_id", "group_id"),)
-
-    def to_domain(self) -> "AuthorizedGroup":
+    def to_domain(self) -> AuthorizedGroup:
         """转换为领域模型"""
-        from src.auth.models import AuthorizedGroup
-
         return AuthorizedGroup(
             id=self.id,
             group_id=self.group_id,
@@ -103,6 +112,23 @@ class AuthorizedGroupModel(Base):
             is_active=self.is_active,
         )
 
+    @classmethod
+    def domain_columns(cls) -> tuple:
+        """rows_to_domain() 所需的查询列（顺序与领域模型字段一致）"""
+        return (
+            cls.id,
+            cls.group_id,
+            cls.chat_title,
+            cls.authorized_by,
+            cls.authorized_at,
+            cls.is_active,
+        )
+
+    @staticmethod
+    def rows_to_domain(rows: Sequence[Row]) -> list[AuthorizedGroup]:
+        """将 domain_columns() 查询结果批量转换为领域模型，不经过 ORM 实例化"""
+        return [AuthorizedGroup(*r) for r in rows]
+
 
 class WhitelistEntryModel(Base):
     """白名单条目表 ORM 模型"""
@@ -132,14 +158,11 @@ class WhitelistEntryModel(Base):
         UniqueConstraint(
             "user_id", "chat_type", "group_id", name="uq_whitelist_user_chat"
         ),
-        Index("idx_whitelist_user_id", "user_id"),
         Index("idx_whitelist_chat", "chat_type", "group_id"),
     )
 
-    def to_domain(self) -> "WhitelistEntry":
+    def to_domain(self) -> WhitelistEntry:
         """转换为领域模型"""
-        from src.auth.models import WhitelistEntry
-
         return WhitelistEntry(
             id=self.id,
             user_id=self.user_id,
@@ -149,6 +172,23 @@ class WhitelistEntryModel(Base):
             created_by=self.created_by,
         )
 
+    @classmethod
+    def domain_columns(cls) -> tuple:
+        """rows_to_domain() 所需的查询列（顺序与领域模型字段一致）"""
+        return (
+            cls.id,
+            cls.user_id,
+            cls.chat_type,
+            cls.group_id,
+            cls.created_at,
+            cls.created_by,
+        )
+
+    @staticmethod
+    def rows_to_domain(rows: Sequence[Row]) -> list[WhitelistEntry]:
+        """将 domain_columns() 查询结果批量转换为领域模型，不经过 ORM 实例化"""
+        return [WhitelistEntry(*r) for r in rows]
+
 
 class UserProfileModel(Base):
     """用户资料表 ORM 模型"""
@@ -170,8 +210,6 @@ class UserProfileModel(Base):
         DateTime, server_default=func.now(), comment="创建时间"
     )
 
-    __table_args__ = (Index("idx_user_profiles_user_id", "user_id"),)
-
 
 class ScheduledTaskModel(Base):
     """定时任务表 ORM 模型
@@ -187,8 +225,9 @@ class ScheduledTaskModel(Base):
     id: Mapped[int] = mapped_column(
         primary_key=True, autoincrement=True, comment="主键ID"
     )
+    # 按用户查询由 idx_scheduled_tasks_user_execute 的前缀列覆盖，不再单独索引
     user_id: Mapped[int] = mapped_column(
-        BigInteger, nullable=False, index=True, comment="用户ID（Telegram用户ID）"
+        BigInteger, nullable=False, comment="用户ID（Telegram用户ID）"
     )
     chat_id: Mapped[int] = mapped_column(
         BigInteger,
@@ -208,11 +247,11 @@ class ScheduledTaskModel(Base):
         index=True,
         comment="执行时间（任务到期时间，带时区）",
     )
+    # 待执行任务由部分索引 idx_scheduled_tasks_pending_keyset 覆盖，不再单独索引
     is_executed: Mapped[bool] = mapped_column(
         Boolean,
         default=False,
         nullable=False,
-        index=True,
         comment="是否已执行",
     )
     created_at: Mapped[Optional[datetime]] = mapped_column(
@@ -226,5 +265,12 @@ class ScheduledTaskModel(Base):
 
     __table_args__ = (
         Index("idx_scheduled_tasks_user_execute", "user_id", "execute_at"),
-        Index("idx_scheduled_tasks_pending", "is_executed", "execute_at"),
+        # 部分索引：只索引未执行的任务，已执行任务不占用索引空间
+        # 包含 id 以支持按 (execute_at, id) 键集分页，且分页查询可走仅索引扫描
+        Index(
+            "idx_scheduled_tasks_pending_keyset",
+            "execute_at",
+            "id",
+            postgresql_where=text("is_executed = false"),
+        ),
     )
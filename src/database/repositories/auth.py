@@ -1,8 +1,21 @@
 """用户权限数据库操作"""
 
-from typing import Optional
-
-from sqlalchemy import delete, select, update
+from typing import AsyncGenerator, Iterable, NamedTuple, Optional
+
+from sqlalchemy import (
+    BigInteger,
+    String,
+    bindparam,
+    cast,
+    column,
+    delete,
+    exists,
+    func,
+    select,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from src.auth.models import AuthorizedGroup, UserPermission, UserRole, WhitelistEntry
 from src.database.engine import get_session
@@ -11,45 +24,77 @@ from src.database.models import (
     UserPermissionModel,
     WhitelistEntryModel,
 )
-
-# ==================== 用户权限操作 ====================
+from src.utils.cache import async_ttl_cache
+
+# 权限检查在每条消息上都会执行，查询结果在进程内缓存，写操作提交后删除对应缓存
+_AUTH_CACHE_TTL = 300
+
+# 高频查询语句在模块加载时构建一次，调用时只绑定参数，
+# SQL 文本保持不变，可稳定命中 SQLAlchemy 编译缓存和 asyncpg 预处理语句缓存
+# 存在性检查使用 SELECT EXISTS(...)，数据库直接返回布尔值，不读取任何列
+_SELECT_IS_SUPER_ADMIN = select(
+    exists().where(
+        UserPermissionModel.user_id == bindparam("user_id"),
+        UserPermissionModel.role == UserRole.SUPER_ADMIN.value,
+    )
+)
+# 一次查询同时得到超管、群组授权、白名单三项结果
+_SELECT_ACCESS = select(
+    exists()
+    .where(
+        UserPermissionModel.user_id == bindparam("user_id"),
+        UserPermissionModel.role == UserRole.SUPER_ADMIN.value,
+    )
+    .label("is_super_admin"),
+    exists()
+    .where(
+        AuthorizedGroupModel.group_id == bindparam("group_id", type_=BigInteger),
+        AuthorizedGroupModel.is_active == True,  # noqa: E712
+    )
+    .label("group_authorized"),
+    exists()
+    .where(
+        WhitelistEntryModel.user_id == bindparam("user_id"),
+        WhitelistEntryModel.chat_type == bindparam("chat_type"),
+        # 私聊时 group_id 为 NULL，使用 IS NOT DISTINCT FROM 统一比较
+        WhitelistEntryModel.group_id.is_not_distinct_from(
+            bindparam("group_id", type_=BigInteger)
+        ),
+    )
+    .label("whitelisted"),
+)
 
 
-async def get_user_permission(user_id: int) -> Optional[UserPermission]:
-    """获取用户权限"""
-    async with get_session() as session:
-        stmt = select(UserPermissionModel).where(UserPermissionModel.user_id == user_id)
-        result = await session.execute(stmt)
-        model = result.scalar_one_or_none()
-
-        return model.to_domain() if model else None
+# ==================== 用户权限操作 ====================
 
 
+@async_ttl_cache(maxsize=4096, ttl=_AUTH_CACHE_TTL)
 async def is_super_admin(user_id: int) -> bool:
-    """检查用户是否为超管"""
-    permission = await get_user_permission(user_id)
-    return permission is not None and permission.role == UserRole.SUPER_ADMIN
+    """检查用户是否为超管（带缓存）"""
+    async with get_session() as session:
+        result = await session.execute(_SELECT_IS_SUPER_ADMIN, {"user_id": user_id})
+        return result.scalar()
 
 
 async def set_user_permission(user_id: int, role: UserRole) -> UserPermission:
     """设置用户权限（存在则更新，不存在则创建）"""
     async with get_session() as session:
-        # 先查询是否存在
-        stmt = select(UserPermissionModel).where(UserPermissionModel.user_id == user_id)
+        # INSERT ... ON CONFLICT DO UPDATE，一次往返完成创建或更新
+        stmt = (
+            pg_insert(UserPermissionModel)
+            .values(user_id=user_id, role=role.value)
+            .on_conflict_do_update(
+                index_elements=[UserPermissionModel.user_id],
+                set_={"role": role.value, "updated_at": func.now()},
+            )
+            .returning(*UserPermissionModel.domain_columns())
+        )
         result = await session.execute(stmt)
-        model = result.scalar_one_or_none()
-
-        if model:
-            # 更新现有记录
-            model.role = role.value
-        else:
-            # 创建新记录
-            model = UserPermissionModel(user_id=user_id, role=role.value)
-            session.add(model)
+        permission = UserPermissionModel.rows_to_domain([result.one()])[0]
 
-        await session.flush()
-        await session.refresh(model)
-        return model.to_domain()
+    is_super_admin.cache_invalidate(user_id)
+    check_access.cache_clear()
+    return permission
 
 
 async def delete_user_permission(user_id: int) -> bool:
@@ -57,7 +102,10 @@ async def delete_user_permission(user_id: int) -> bool:
     async with get_session() as session:
         stmt = delete(UserPermissionModel).where(UserPermissionModel.user_id == user_id)
         result = await session.execute(stmt)
-        return result.rowcount == 1
+
+    is_super_admin.cache_invalidate(user_id)
+    check_access.cache_clear()
+    return result.rowcount == 1
 
 
 async def list_super_admins() -> list[int]:
@@ -70,18 +118,44 @@ async def list_super_admins() -> list[int]:
         return [row[0] for row in result.all()]
 
 
-# ==================== 群组授权操作 ====================
+async def preload_super_admins() -> int:
+    """预热所有超管的权限缓存，避免启动后首批消息查询数据库
 
+    同时写入 is_super_admin 和私聊场景的 check_access 缓存（消息处理实际使用的路径）。
+    群组场景的 check_access 还依赖群组授权状态，无法提前预热。
 
-async def is_group_authorized(group_id: int) -> bool:
-    """检查群组是否已授权"""
+    Returns:
+        预热的超管数量
+    """
     async with get_session() as session:
-        stmt = select(AuthorizedGroupModel.id).where(
-            AuthorizedGroupModel.group_id == group_id,
-            AuthorizedGroupModel.is_active == True,  # noqa: E712
-        )
+        stmt = select(
+            UserPermissionModel.user_id,
+            exists()
+            .where(
+                WhitelistEntryModel.user_id == UserPermissionModel.user_id,
+                WhitelistEntryModel.chat_type == "private",
+                WhitelistEntryModel.group_id.is_(None),
+            )
+            .label("whitelisted"),
+        ).where(UserPermissionModel.role == UserRole.SUPER_ADMIN.value)
         result = await session.execute(stmt)
-        return result.scalar_one_or_none() is not None
+        rows = result.all()
+
+    for user_id, whitelisted in rows:
+        is_super_admin.cache_set(True, user_id)
+        # 私聊时 group_id 为 NULL，群组授权一项恒为 False
+        check_access.cache_set(
+            AccessFlags(
+                is_super_admin=True, group_authorized=False, whitelisted=whitelisted
+            ),
+            user_id,
+            "private",
+            None,
+        )
+    return len(rows)
+
+
+# ==================== 群组授权操作 ====================
 
 
 async def get_authorized_group(group_id: int) -> Optional[AuthorizedGroup]:
@@ -101,30 +175,28 @@ async def authorize_group(
 ) -> AuthorizedGroup:
     """授权群组（存在则激活并更新，不存在则创建）"""
     async with get_session() as session:
-        # 先查询是否存在
-        stmt = select(AuthorizedGroupModel).where(
-            AuthorizedGroupModel.group_id == group_id
+        # INSERT ... ON CONFLICT DO UPDATE，一次往返完成创建或激活
+        stmt = pg_insert(AuthorizedGroupModel).values(
+            group_id=group_id,
+            chat_title=chat_title,
+            authorized_by=authorized_by,
         )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[AuthorizedGroupModel.group_id],
+            set_={
+                "is_active": True,
+                # 新标题为空时保留原标题
+                "chat_title": func.coalesce(
+                    func.nullif(stmt.excluded.chat_title, ""),
+                    AuthorizedGroupModel.chat_title,
+                ),
+            },
+        ).returning(*AuthorizedGroupModel.domain_columns())
         result = await session.execute(stmt)
-        model = result.scalar_one_or_none()
+        group = AuthorizedGroupModel.rows_to_domain([result.one()])[0]
 
-        if model:
-            # 更新现有记录
-            model.is_active = True
-            if chat_title:
-                model.chat_title = chat_title
-        else:
-            # 创建新记录
-            model = AuthorizedGroupModel(
-                group_id=group_id,
-                chat_title=chat_title,
-                authorized_by=authorized_by,
-            )
-            session.add(model)
-
-        await session.flush()
-        await session.refresh(model)
-        return model.to_domain()
+    check_access.cache_clear()
+    return group
 
 
 async def revoke_group_authorization(group_id: int) -> bool:
@@ -136,48 +208,26 @@ async def revoke_group_authorization(group_id: int) -> bool:
             .values(is_active=False)
         )
         result = await session.execute(stmt)
-        return result.rowcount == 1
+
+    check_access.cache_clear()
+    return result.rowcount == 1
 
 
 async def list_authorized_groups() -> list[AuthorizedGroup]:
     """列出所有已授权的群组"""
     async with get_session() as session:
         stmt = (
-            select(AuthorizedGroupModel)
+            select(*AuthorizedGroupModel.domain_columns())
             .where(AuthorizedGroupModel.is_active == True)  # noqa: E712
             .order_by(AuthorizedGroupModel.authorized_at.desc())
         )
         result = await session.execute(stmt)
-        models = result.scalars().all()
-
-        return [model.to_domain() for model in models]
+        return AuthorizedGroupModel.rows_to_domain(result.all())
 
 
 # ==================== 白名单操作 ====================
 
 
-async def is_user_whitelisted(
-    user_id: int, chat_type: str, group_id: Optional[int] = None
-) -> bool:
-    """检查用户是否在白名单中"""
-    async with get_session() as session:
-        # 使用 is_ 处理 NULL 比较
-        if group_id is None:
-            stmt = select(WhitelistEntryModel.id).where(
-                WhitelistEntryModel.user_id == user_id,
-                WhitelistEntryModel.chat_type == chat_type,
-                WhitelistEntryModel.group_id.is_(None),
-            )
-        else:
-            stmt = select(WhitelistEntryModel.id).where(
-                WhitelistEntryModel.user_id == user_id,
-                WhitelistEntryModel.chat_type == chat_type,
-                WhitelistEntryModel.group_id == group_id,
-            )
-        result = await session.execute(stmt)
-        return result.scalar_one_or_none() is not None
-
-
 async def add_to_whitelist(
     user_id: int,
     chat_type: str,
@@ -186,36 +236,107 @@ async def add_to_whitelist(
 ) -> WhitelistEntry:
     """添加用户到白名单（已存在则返回现有记录）"""
     async with get_session() as session:
-        # 先检查是否已存在
-        if group_id is None:
-            stmt = select(WhitelistEntryModel).where(
-                WhitelistEntryModel.user_id == user_id,
-                WhitelistEntryModel.chat_type == chat_type,
-                WhitelistEntryModel.group_id.is_(None),
+        if group_id is not None:
+            # 冲突时执行空更新，使 RETURNING 同样返回已存在的记录，一次往返完成
+            stmt = pg_insert(WhitelistEntryModel).values(
+                user_id=user_id,
+                chat_type=chat_type,
+                group_id=group_id,
+                created_by=created_by,
             )
+            stmt = stmt.on_conflict_do_update(
+                constraint="uq_whitelist_user_chat",
+                set_={"user_id": stmt.excluded.user_id},
+            ).returning(*WhitelistEntryModel.domain_columns())
+            result = await session.execute(stmt)
+            entry = WhitelistEntryModel.rows_to_domain([result.one()])[0]
         else:
+            # 私聊白名单的 group_id 为 NULL，不会触发唯一约束冲突，需先检查是否已存在
             stmt = select(WhitelistEntryModel).where(
                 WhitelistEntryModel.user_id == user_id,
                 WhitelistEntryModel.chat_type == chat_type,
-                WhitelistEntryModel.group_id == group_id,
+                WhitelistEntryModel.group_id.is_(None),
             )
-        result = await session.execute(stmt)
-        model = result.scalar_one_or_none()
+            result = await session.execute(stmt)
+            model = result.scalar_one_or_none()
+
+            if model is None:
+                # 创建新记录
+                model = WhitelistEntryModel(
+                    user_id=user_id,
+                    chat_type=chat_type,
+                    group_id=None,
+                    created_by=created_by,
+                )
+                session.add(model)
+                await session.flush()
+                await session.refresh(model)
+            entry = model.to_domain()
+
+    check_access.cache_clear()
+    return entry
+
+
+def _build_bulk_whitelist_insert(
+    entries: list[tuple[int, str, Optional[int], Optional[int]]],
+):
+    """构建批量添加白名单的 INSERT ... SELECT FROM (VALUES ...) 语句"""
+    new_entries = values(
+        column("user_id", BigInteger),
+        column("chat_type", String),
+        column("group_id", BigInteger),
+        column("created_by", BigInteger),
+        name="new_entries",
+    ).data(entries)
+
+    # 某列全部为 NULL 时 PostgreSQL 会将 VALUES 中该列推断为 text，需要显式转换类型
+    group_id = cast(new_entries.c.group_id, BigInteger)
+    created_by = cast(new_entries.c.created_by, BigInteger)
+
+    # 私聊条目的 group_id 为 NULL，唯一约束不会冲突，需要用 NOT EXISTS 跳过已存在的条目
+    # ON CONFLICT DO NOTHING 用于处理与并发写入之间的冲突
+    return (
+        pg_insert(WhitelistEntryModel)
+        .from_select(
+            ["user_id", "chat_type", "group_id", "created_by"],
+            select(
+                new_entries.c.user_id, new_entries.c.chat_type, group_id, created_by
+            ).where(
+                ~exists().where(
+                    WhitelistEntryModel.user_id == new_entries.c.user_id,
+                    WhitelistEntryModel.chat_type == new_entries.c.chat_type,
+                    WhitelistEntryModel.group_id.is_not_distinct_from(group_id),
+                )
+            ),
+        )
+        .on_conflict_do_nothing()
+    )
 
-        if model:
-            return model.to_domain()
 
-        # 创建新记录
-        model = WhitelistEntryModel(
-            user_id=user_id,
-            chat_type=chat_type,
-            group_id=group_id,
-            created_by=created_by,
-        )
-        session.add(model)
-        await session.flush()
-        await session.refresh(model)
-        return model.to_domain()
+async def bulk_add_to_whitelist(
+    rows: Iterable[tuple[int, str, Optional[int], Optional[int]]],
+) -> int:
+    """批量添加用户到白名单（已存在的跳过）
+
+    所有条目通过一条 INSERT ... SELECT FROM (VALUES ...) 语句一次发送。
+
+    Args:
+        rows: (user_id, chat_type, group_id, created_by) 元组序列
+
+    Returns:
+        实际新增的条目数
+    """
+    # 按唯一键去重，避免同一批次内重复插入
+    entries = {(r[0], r[1], r[2]): r for r in rows}
+    if not entries:
+        return 0
+
+    stmt = _build_bulk_whitelist_insert(list(entries.values()))
+    async with get_session() as session:
+        result = await session.execute(stmt)
+
+    check_access.cache_clear()
+    return result.rowcount
 
 
 async def remove_from_whitelist(
@@ -237,27 +358,84 @@ async def remove_from_whitelist(
                 WhitelistEntryModel.group_id == group_id,
             )
         result = await session.execute(stmt)
-        return result.rowcount == 1
 
+    check_access.cache_clear()
+    return result.rowcount == 1
 
-async def list_whitelist(
-    chat_type: Optional[str] = None, group_id: Optional[int] = None
-) -> list[WhitelistEntry]:
-    """列出白名单，可按 chat_type 和 group_id 过滤"""
+
+def _build_whitelist_query(chat_type: Optional[str], group_id: Optional[int]):
+    """构建白名单列表查询，可按 chat_type 和 group_id 过滤"""
+    stmt = select(*WhitelistEntryModel.domain_columns())
+
+    # 构建过滤条件
+    if chat_type and group_id is not None:
+        stmt = stmt.where(
+            WhitelistEntryModel.chat_type == chat_type,
+            WhitelistEntryModel.group_id == group_id,
+        )
+    elif chat_type:
+        stmt = stmt.where(WhitelistEntryModel.chat_type == chat_type)
+
+    return stmt.order_by(WhitelistEntryModel.created_at.desc())
+
+
+async def iter_whitelist(
+    chat_type: Optional[str] = None,
+    group_id: Optional[int] = None,
+    batch_size: int = 1000,
+) -> AsyncGenerator[WhitelistEntry, None]:
+    """逐条遍历白名单，可按 chat_type 和 group_id 过滤
+
+    使用服务端游标分批读取并转换，白名单较大时内存占用只与批大小相关。
+
+    Args:
+        chat_type: 聊天类型
+        group_id: 群组 ID
+        batch_size: 每批读取的行数
+
+    Yields:
+        白名单条目
+    """
     async with get_session() as session:
-        stmt = select(WhitelistEntryModel)
+        stmt = _build_whitelist_query(chat_type, group_id).execution_options(
+            yield_per=batch_size
+        )
+        result = await session.stream(stmt)
+        async for rows in result.partitions():
+            for entry in WhitelistEntryModel.rows_to_domain(rows):
+                yield entry
 
-        # 构建过滤条件
-        if chat_type and group_id is not None:
-            stmt = stmt.where(
-                WhitelistEntryModel.chat_type == chat_type,
-                WhitelistEntryModel.group_id == group_id,
-            )
-        elif chat_type:
-            stmt = stmt.where(WhitelistEntryModel.chat_type == chat_type)
 
-        stmt = stmt.order_by(WhitelistEntryModel.created_at.desc())
-        result = await session.execute(stmt)
-        models = result.scalars().all()
+# ==================== 综合权限检查 ====================
+
+
+class AccessFlags(NamedTuple):
+    """用户在某个会话中的权限检查结果"""
+
+    is_super_admin: bool
+    group_authorized: bool
+    whitelisted: bool
+
 
-        return [model.to_domain() for model in models]
+@async_ttl_cache(maxsize=4096, ttl=_AUTH_CACHE_TTL)
+async def check_access(
+    user_id: int, chat_type: str, group_id: Optional[int] = None
+) -> AccessFlags:
+    """一次查询完成超管、群组授权和白名单检查（带缓存）
+
+    结果同时依赖用户和群组，任意权限写操作后整体清空缓存。
+
+    Args:
+        user_id: 用户 ID
+        chat_type: 聊天类型（private/group）
+        group_id: 群组 ID（私聊时为 None）
+
+    Returns:
+        权限检查结果
+    """
+    async with get_session() as session:
+        result = await session.execute(
+            _SELECT_ACCESS,
+            {"user_id": user_id, "chat_type": chat_type, "group_id": group_id},
+        )
+        return AccessFlags(*result.one())
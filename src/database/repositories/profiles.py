@@ -1,20 +1,36 @@
 """用户资料数据库操作"""
 
-from typing import Any, Optional
+from typing import Any, Iterable, Optional
 
-from sqlalchemy import select
+from sqlalchemy import bindparam, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from src.database.engine import get_session
 from src.database.models import UserProfileModel
 
+# 位置信息返回的列
+_PROFILE_COLUMNS = (
+    UserProfileModel.user_id,
+    UserProfileModel.latitude,
+    UserProfileModel.longitude,
+    UserProfileModel.timezone,
+    UserProfileModel.location_updated_at,
+    UserProfileModel.created_at,
+)
+
+# 位置查询在每次对话中都会执行，语句只构建一次
+_SELECT_LOCATION = select(*_PROFILE_COLUMNS).where(
+    UserProfileModel.user_id == bindparam("user_id")
+)
+
 
 async def save_user_location(
     user_id: int,
     latitude: float,
     longitude: float,
     timezone: Optional[str] = None,
-) -> bool:
-    """保存用户位置信息到数据库
+) -> Optional[dict[str, Any]]:
+    """保存用户位置信息到数据库（存在则更新，不存在则创建）
 
     Args:
         user_id: 用户 ID
@@ -23,31 +39,72 @@ async def save_user_location(
         timezone: 时区（可选）
 
     Returns:
-        是否保存成功
+        保存后的位置信息字典
     """
     async with get_session() as session:
-        # 查询是否存在
-        stmt = select(UserProfileModel).where(UserProfileModel.user_id == user_id)
-        result = await session.execute(stmt)
-        model = result.scalar_one_or_none()
-
-        if model:
-            # 更新现有记录
-            model.latitude = latitude
-            model.longitude = longitude
-            model.timezone = timezone
-        else:
-            # 创建新记录
-            model = UserProfileModel(
+        stmt = (
+            pg_insert(UserProfileModel)
+            .values(
                 user_id=user_id,
                 latitude=latitude,
                 longitude=longitude,
                 timezone=timezone,
             )
-            session.add(model)
+            .on_conflict_do_update(
+                index_elements=[UserProfileModel.user_id],
+                set_={
+                    "latitude": latitude,
+                    "longitude": longitude,
+                    "timezone": timezone,
+                    "location_updated_at": func.now(),
+                },
+            )
+            .returning(*_PROFILE_COLUMNS)
+        )
+        result = await session.execute(stmt)
+        row = result.mappings().one_or_none()
+        return dict(row) if row else None
+
 
-        await session.flush()
-        return True
+async def bulk_save_user_locations(
+    rows: Iterable[tuple[int, float, float, Optional[str]]],
+) -> int:
+    """批量保存用户位置信息（存在则更新，不存在则创建）
+
+    语句不带 RETURNING，SQLAlchemy 会通过 asyncpg 的 executemany 执行：
+    同一条预处理语句配合多组参数一次性发送，避免逐行往返。
+
+    Args:
+        rows: (user_id, latitude, longitude, timezone) 元组序列
+
+    Returns:
+        保存的行数
+    """
+    params = [
+        {
+            "user_id": user_id,
+            "latitude": latitude,
+            "longitude": longitude,
+            "timezone": timezone,
+        }
+        for user_id, latitude, longitude, timezone in rows
+    ]
+    if not params:
+        return 0
+
+    stmt = pg_insert(UserProfileModel)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[UserProfileModel.user_id],
+        set_={
+            "latitude": stmt.excluded.latitude,
+            "longitude": stmt.excluded.longitude,
+            "timezone": stmt.excluded.timezone,
+            "location_updated_at": func.now(),
+        },
+    )
+    async with get_session() as session:
+        await session.execute(stmt, params)
+    return len(params)
 
 
 async def get_user_location(user_id: int) -> Optional[dict[str, Any]]:
@@ -60,17 +117,6 @@ async def get_user_location(user_id: int) -> Optional[dict[str, Any]]:
         包含位置信息的字典，如果不存在则返回 None
     """
     async with get_session() as session:
-        stmt = select(UserProfileModel).where(UserProfileModel.user_id == user_id)
-        result = await session.execute(stmt)
-        model = result.scalar_one_or_none()
-
-        if model:
-            return {
-                "user_id": model.user_id,
-                "latitude": model.latitude,
-                "longitude": model.longitude,
-                "timezone": model.timezone,
-                "location_updated_at": model.location_updated_at,
-                "created_at": model.created_at,
-            }
-        return None
+        result = await session.execute(_SELECT_LOCATION, {"user_id": user_id})
+        row = result.mappings().one_or_none()
+        return dict(row) if row else None
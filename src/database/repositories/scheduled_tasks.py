@@ -1,14 +1,19 @@
 """定时任务数据访问层"""
 
 from datetime import datetime, timezone
-from typing import Optional
+from typing import AsyncGenerator, Optional
 
-from sqlalchemy import select
+from sqlalchemy import Row, bindparam, select, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database.engine import get_session
 from src.database.models import ScheduledTaskModel
 
+# 按 ID 查询任务的语句只构建一次，调用时只绑定参数
+_SELECT_TASK_BY_ID = select(ScheduledTaskModel).where(
+    ScheduledTaskModel.id == bindparam("task_id")
+)
+
 
 async def create_task(
     user_id: int,
@@ -43,53 +48,101 @@ async def create_task(
         return task
 
 
-async def get_pending_tasks(limit: int = 1000) -> list[ScheduledTaskModel]:
-    """用于系统启动时恢复所有待执行的任务
+async def get_pending_tasks(
+    now: datetime,
+    after: Optional[tuple[datetime, int]] = None,
+    limit: int = 1000,
+) -> list[Row]:
+    """按 (execute_at, id) 顺序获取一页待执行任务
+
+    只查询 id 和 execute_at，可直接由部分索引完成仅索引扫描。
 
     Args:
-        limit: 返回数量限制
+        now: 当前时间，只返回晚于该时间执行的任务
+        after: 上一页最后一条的 (execute_at, id)，为 None 时从头开始
+        limit: 每页数量
 
     Returns:
-        待执行任务列表
+        包含 id、execute_at 的行列表
     """
     async with get_session() as session:
-        now = datetime.now(timezone.utc)
-        stmt = (
-            select(ScheduledTaskModel)
-            .where(
-                ScheduledTaskModel.is_executed == False,  # noqa: E712
-                ScheduledTaskModel.execute_at > now,
-            )
-            .order_by(ScheduledTaskModel.execute_at)
-            .limit(limit)
+        stmt = select(ScheduledTaskModel.id, ScheduledTaskModel.execute_at).where(
+            ScheduledTaskModel.is_executed == False,  # noqa: E712
+            ScheduledTaskModel.execute_at > now,
         )
+        if after is not None:
+            stmt = stmt.where(
+                tuple_(ScheduledTaskModel.execute_at, ScheduledTaskModel.id)
+                > tuple_(*after)
+            )
+        stmt = stmt.order_by(
+            ScheduledTaskModel.execute_at, ScheduledTaskModel.id
+        ).limit(limit)
 
         result = await session.execute(stmt)
-        return list(result.scalars().all())
+        return list(result.all())
+
+
+async def iter_pending_tasks(
+    limit: int = 10000, batch_size: int = 1000
+) -> AsyncGenerator[Row, None]:
+    """用于系统启动时恢复所有待执行的任务
+
+    使用键集分页逐页读取，每页单独查询，不会长时间占用连接和事务。
+
+    Args:
+        limit: 返回数量限制
+        batch_size: 每页读取的行数
+
+    Yields:
+        包含 id、execute_at 的待执行任务行
+    """
+    now = datetime.now(timezone.utc)
+    after: Optional[tuple[datetime, int]] = None
+    remaining = limit
+
+    while remaining > 0:
+        rows = await get_pending_tasks(now, after, min(batch_size, remaining))
+        for row in rows:
+            yield row
+
+        if len(rows) < batch_size:
+            break
+        remaining -= len(rows)
+        last = rows[-1]
+        after = (last.execute_at, last.id)
 
 
 async def get_task_by_id(task_id: int) -> Optional[ScheduledTaskModel]:
     """根据 ID 获取任务"""
     async with get_session() as session:
-        stmt = select(ScheduledTaskModel).where(ScheduledTaskModel.id == task_id)
-        result = await session.execute(stmt)
+        result = await session.execute(_SELECT_TASK_BY_ID, {"task_id": task_id})
         return result.scalar_one_or_none()
 
 
-async def mark_task_as_executed(task_id: int) -> bool:
-    """标记任务为已执行"""
-    async with get_session() as session:
-        stmt = select(ScheduledTaskModel).where(ScheduledTaskModel.id == task_id)
-        result = await session.execute(stmt)
-        task = result.scalar_one_or_none()
+async def claim_task(task_id: int) -> Optional[ScheduledTaskModel]:
+    """领取待执行任务：原子地标记为已执行并返回任务
 
-        if not task:
-            return False
+    仅当任务存在且未执行时才会领取成功，多实例部署时可避免重复执行。
 
-        task.is_executed = True
-        task.executed_at = datetime.now(timezone.utc)
-        await session.flush()
-        return True
+    Args:
+        task_id: 任务 ID
+
+    Returns:
+        领取成功返回任务，任务不存在或已执行返回 None
+    """
+    async with get_session() as session:
+        stmt = (
+            update(ScheduledTaskModel)
+            .where(
+                ScheduledTaskModel.id == task_id,
+                ScheduledTaskModel.is_executed == False,  # noqa: E712
+            )
+            .values(is_executed=True, executed_at=datetime.now(timezone.utc))
+            .returning(ScheduledTaskModel)
+        )
+        result = await session.execute(stmt)
+        return result.scalar_one_or_none()
 
 
 async def get_tasks_by_chat(chat_id: int) -> list[ScheduledTaskModel]:
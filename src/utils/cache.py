@@ -0,0 +1,118 @@
+"""进程内缓存工具"""
+
+import functools
+import inspect
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, TypeVar
+
+T = TypeVar("T")
+
+# 缓存未命中标记，用于区分"未缓存"和"缓存值为 None"
+MISSING: Any = object()
+
+
+class TTLCache:
+    """带过期时间和容量上限的 LRU 缓存
+
+    仅在事件循环线程中访问，不做加锁处理。
+    """
+
+    def __init__(self, maxsize: int = 4096, ttl: float = 300) -> None:
+        """
+        Args:
+            maxsize: 最大缓存条目数，超出后淘汰最久未使用的条目
+            ttl: 缓存有效期（秒）
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Hashable) -> Any:
+        """获取缓存值，未命中或已过期时返回 MISSING"""
+        item = self._data.get(key)
+        if item is None:
+            return MISSING
+
+        expires_at, value = item
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return MISSING
+
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """写入缓存值"""
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        """删除缓存值（不存在时忽略）"""
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """清空缓存"""
+        self._data.clear()
+
+
+def async_ttl_cache(
+    maxsize: int = 4096, ttl: float = 60
+) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
+    """异步函数结果缓存装饰器
+
+    以调用参数（补全默认值后）作为缓存键。查询期间如果发生过失效或清空，
+    本次结果不会写入缓存。被装饰函数提供：
+    - cache_invalidate(*args, **kwargs): 删除对应参数的缓存
+    - cache_set(value, *args, **kwargs): 直接写入对应参数的缓存（用于预热）
+    - cache_clear(): 清空缓存
+
+    Args:
+        maxsize: 最大缓存条目数
+        ttl: 缓存有效期（秒）
+    """
+
+    def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        signature = inspect.signature(func)
+        # 每次失效操作后递增，查询期间发生过失效时不写回缓存，避免旧结果覆盖失效
+        generation = 0
+
+        def make_key(*args: Any, **kwargs: Any) -> tuple:
+            # 补全默认值，保证 f(1, "a") 与 f(1, "a", None) 命中同一个缓存
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            return tuple(bound.arguments.values())
+
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> T:
+            key = make_key(*args, **kwargs)
+            value = cache.get(key)
+            if value is MISSING:
+                started_at = generation
+                value = await func(*args, **kwargs)
+                if started_at == generation:
+                    cache.set(key, value)
+            return value
+
+        def cache_invalidate(*args: Any, **kwargs: Any) -> None:
+            nonlocal generation
+            generation += 1
+            cache.delete(make_key(*args, **kwargs))
+
+        def cache_clear() -> None:
+            nonlocal generation
+            generation += 1
+            cache.clear()
+
+        def cache_set(value: T, *args: Any, **kwargs: Any) -> None:
+            cache.set(make_key(*args, **kwargs), value)
+
+        wrapper.cache_invalidate = cache_invalidate
+        wrapper.cache_set = cache_set
+        wrapper.cache_clear = cache_clear
+        return wrapper
+
+    return decorator
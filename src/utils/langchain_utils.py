@@ -1,29 +1,41 @@
 """LangChain 相关工具函数"""
 
 import logging
-from typing import List, cast
+from typing import List
 
-from langchain_core.messages import BaseMessage, trim_messages
+from langchain_core.messages import BaseMessage
 
 logger = logging.getLogger(__name__)
 
 
 def limit_messages(messages: List[BaseMessage], max_count: int) -> List[BaseMessage]:
-    """使用 trim_messages 策略限制消息数量"""
-    if len(messages) <= max_count:
+    """限制消息数量，保留开头的系统消息和最近的消息
+
+    等价于 trim_messages(strategy="last", token_counter=len, include_system=True,
+    start_on="human", allow_partial=False)，直接通过切片实现，避免每轮对话的额外开销。
+    保留的最近消息从第一条用户消息开始。
+    """
+    total = len(messages)
+    if total <= max_count:
         return messages
 
-    trimmed_messages = trim_messages(
-        messages,
-        max_tokens=max_count,
-        token_counter=len,
-        strategy="last",
-        include_system=True,
-        start_on="human",
-        allow_partial=False,
-    )
+    # 开头的系统消息始终保留，并占用一条名额
+    prefix = 1 if messages[0].type == "system" else 0
+
+    # 在最近 max_count - prefix 条消息中找到第一条用户消息
+    start = max(prefix, total - (max_count - prefix))
+    for i in range(start, total):
+        if messages[i].type == "human":
+            trimmed_messages = messages[:prefix] + messages[i:]
+            break
+    else:
+        trimmed_messages = messages[:prefix]
 
+    # 使用 % 占位符，DEBUG 级别未启用时不做字符串格式化
     logger.debug(
-        f"消息条数超过限制 {max_count}，已从 {len(messages)} 条截断为 {len(trimmed_messages)} 条"
+        "消息条数超过限制 %d，已从 %d 条截断为 %d 条",
+        max_count,
+        total,
+        len(trimmed_messages),
     )
-    return cast(List[BaseMessage], trimmed_messages)
+    return trimmed_messages
@@ -1,7 +1,9 @@
 """日志配置模块"""
 
+import atexit
 import logging
-from logging.handlers import RotatingFileHandler
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 
 from src.utils.settings import setting
@@ -42,9 +44,17 @@ def setup_logger() -> logging.Logger:
     console_handler.setFormatter(formatter)
     console_handler.setLevel(logging.INFO)
 
+    # 日志先放入队列，由后台线程写入文件和控制台，避免磁盘 I/O 阻塞事件循环
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    listener = QueueListener(
+        log_queue, file_handler, console_handler, respect_handler_level=True
+    )
+    listener.start()
+    # 退出时停止监听线程，确保队列中剩余的日志写完
+    atexit.register(listener.stop)
+
     # 配置根日志记录器
     root_logger.setLevel(getattr(logging, log_level, logging.INFO))
-    root_logger.addHandler(file_handler)
-    root_logger.addHandler(console_handler)
+    root_logger.addHandler(QueueHandler(log_queue))
 
     return root_logger
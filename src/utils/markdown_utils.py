@@ -0,0 +1,20 @@
+"""Markdown 相关工具函数"""
+
+import functools
+
+from telegramify_markdown import markdownify
+
+# 仅缓存较短的文本（如定时提醒、固定话术），避免长回复占用缓存
+_CACHE_MAX_LENGTH = 500
+
+
+@functools.lru_cache(maxsize=1024)
+def _markdownify_cached(text: str) -> str:
+    return markdownify(text)
+
+
+def to_telegram_markdown(text: str) -> str:
+    """将标准 Markdown 转换为 Telegram MarkdownV2 格式，短文本结果会被缓存"""
+    if len(text) > _CACHE_MAX_LENGTH:
+        return markdownify(text)
+    return _markdownify_cached(text)
@@ -1,5 +1,6 @@
 """项目配置和初始化模块"""
 
+import functools
 import sys
 from pathlib import Path
 from typing import Any
@@ -26,6 +27,55 @@ class Settings(BaseSettings):
     POSTGRES_DB: str = Field(..., description="PostgreSQL 数据库名")
     POSTGRES_USER: str = Field(..., description="PostgreSQL 用户名")
     POSTGRES_PASSWORD: str = Field(..., description="PostgreSQL 密码")
+    POSTGRES_POOL_MIN: int | None = Field(
+        default=None,
+        description="psycopg 连接池最小连接数（默认为最大连接数的一半，启动时预热）",
+    )
+    POSTGRES_POOL_MAX: int = Field(default=50, description="psycopg 连接池最大连接数")
+    POSTGRES_POOL_TIMEOUT: float = Field(
+        default=10, description="从 psycopg 连接池获取连接的超时时间（秒）"
+    )
+    POSTGRES_POOL_MAX_LIFETIME: float = Field(
+        default=1800,
+        description="psycopg 连接池中连接的最长存活时间（秒），长期复用以保留服务端预处理语句",
+    )
+    POSTGRES_ENGINE_POOL_SIZE: int = Field(
+        default=10, description="SQLAlchemy 连接池常驻连接数"
+    )
+    POSTGRES_ENGINE_MAX_OVERFLOW: int = Field(
+        default=20, description="SQLAlchemy 连接池允许超出常驻连接数的额外连接数"
+    )
+    POSTGRES_POOL_RECYCLE: int = Field(
+        default=300,
+        description="连接最长复用时间（秒），应略小于服务端/PgBouncer 的空闲连接超时",
+    )
+    POSTGRES_STATEMENT_CACHE_SIZE: int = Field(
+        default=1024, description="asyncpg 每个连接缓存的预处理语句数量"
+    )
+    POSTGRES_QUERY_CACHE_SIZE: int = Field(
+        default=1200, description="SQLAlchemy 编译语句缓存的条目数"
+    )
+    POSTGRES_DISABLE_JIT: bool = Field(
+        default=False,
+        description="是否关闭 PostgreSQL JIT（业务表均为短查询，关闭可降低规划开销）",
+    )
+    POSTGRES_USE_PGBOUNCER: bool = Field(
+        default=False,
+        description="是否经由 PgBouncer（事务模式）连接，启用后关闭连接检测和语句缓存",
+    )
+    POSTGRES_POOL_PRE_PING: bool = Field(
+        default=True, description="SQLAlchemy 取出连接前是否先检测连接可用"
+    )
+    POSTGRES_POOL_ROLLBACK_ON_RETURN: bool = Field(
+        default=False,
+        description="SQLAlchemy 归还连接时是否执行 ROLLBACK（会话已负责结束事务）",
+    )
+    POSTGRES_CONNECT_TIMEOUT: float = Field(
+        default=10, description="asyncpg 建立连接的超时时间（秒）"
+    )
+    POSTGRES_COMMAND_TIMEOUT: float = Field(
+        default=60, description="asyncpg 单条语句的执行超时时间（秒）"
+    )
 
     OPENAI_API_KEY: str = Field(..., description="OpenAI 兼容 API Key")
     OPENAI_BASE_URL: str = Field(..., description="OpenAI 兼容 API Base URL")
@@ -59,8 +109,9 @@ class Settings(BaseSettings):
 setting = Settings()
 
 
+@functools.lru_cache(maxsize=1)
 def get_embeddings() -> OpenAIEmbeddings:
-    """获取嵌入模型实例"""
+    """获取嵌入模型实例（单例，复用底层 HTTP 客户端）"""
     return OpenAIEmbeddings(
         api_key=setting.EMBEDDING_API_KEY,
         base_url=setting.EMBEDDING_BASE_URL,
@@ -74,12 +125,24 @@ def get_index_config(embeddings: OpenAIEmbeddings) -> dict:
     return {"dims": setting.EMBEDDING_DIMS, "embed": embeddings, "fields": ["value"]}
 
 
+@functools.lru_cache(maxsize=1)
 def get_db_config() -> dict[str, Any]:
-    """获取数据库配置"""
+    """获取数据库配置（结果会被缓存，调用方不应修改返回的字典）"""
     return {
         "host": setting.POSTGRES_HOST,
         "port": setting.POSTGRES_PORT,
         "database": setting.POSTGRES_DB,
         "user": setting.POSTGRES_USER,
         "password": setting.POSTGRES_PASSWORD,
+        "pool_size": setting.POSTGRES_ENGINE_POOL_SIZE,
+        "max_overflow": setting.POSTGRES_ENGINE_MAX_OVERFLOW,
+        "pool_recycle": setting.POSTGRES_POOL_RECYCLE,
+        "statement_cache_size": setting.POSTGRES_STATEMENT_CACHE_SIZE,
+        "query_cache_size": setting.POSTGRES_QUERY_CACHE_SIZE,
+        "disable_jit": setting.POSTGRES_DISABLE_JIT,
+        "use_pgbouncer": setting.POSTGRES_USE_PGBOUNCER,
+        "pool_pre_ping": setting.POSTGRES_POOL_PRE_PING,
+        "rollback_on_return": setting.POSTGRES_POOL_ROLLBACK_ON_RETURN,
+        "connect_timeout": setting.POSTGRES_CONNECT_TIMEOUT,
+        "command_timeout": setting.POSTGRES_COMMAND_TIMEOUT,
     }
@@ -0,0 +1,29 @@
+"""测试公共配置"""
+
+import os
+import sys
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+# 导入 settings 时需要的必填配置，测试中只用于构建对象，不会真正连接
+for _key, _value in {
+    "TELEGRAM_BOT_TOKEN": "test-token",
+    "POSTGRES_HOST": "localhost",
+    "POSTGRES_PORT": "5432",
+    "POSTGRES_DB": "telepal_test",
+    "POSTGRES_USER": "telepal",
+    "POSTGRES_PASSWORD": "telepal",
+    "OPENAI_API_KEY": "test-key",
+    "OPENAI_BASE_URL": "http://localhost",
+    "OPENAI_MODEL": "test-model",
+    "MAX_MESSAGES_IN_STATE": "20",
+    "EMBEDDING_API_KEY": "test-key",
+    "EMBEDDING_BASE_URL": "http://localhost",
+    "EMBEDDING_MODEL": "test-embedding",
+    "EMBEDDING_DIMS": "8",
+}.items():
+    os.environ.setdefault(_key, _value)
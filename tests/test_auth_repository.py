@@ -0,0 +1,23 @@
+"""权限数据访问层测试"""
+
+from sqlalchemy.dialects import postgresql
+
+from src.database.repositories.auth import _build_bulk_whitelist_insert
+
+
+def _compile(entries) -> str:
+    stmt = _build_bulk_whitelist_insert(entries)
+    return str(stmt.compile(dialect=postgresql.asyncpg.dialect()))
+
+
+def test_bulk_whitelist_insert_casts_all_private_batch():
+    """全部为私聊条目时 group_id 全为 NULL，必须显式转换为 BIGINT"""
+    sql = _compile([(1, "private", None, 1), (2, "private", None, None)])
+
+    assert "CAST(new_entries.group_id AS BIGINT)" in sql
+    assert "CAST(new_entries.created_by AS BIGINT)" in sql
+    assert (
+        "whitelist.group_id IS NOT DISTINCT FROM CAST(new_entries.group_id AS BIGINT)"
+        in sql
+    )
+    assert "ON CONFLICT DO NOTHING" in sql
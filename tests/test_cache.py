@@ -0,0 +1,57 @@
+"""进程内缓存测试"""
+
+import asyncio
+
+from src.utils.cache import async_ttl_cache
+
+
+def test_invalidate_during_query_does_not_cache_stale_result():
+    """查询进行中发生失效时，旧结果不能写回缓存"""
+    state = {"authorized": True, "calls": 0}
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    @async_ttl_cache(maxsize=16, ttl=60)
+    async def is_authorized(group_id: int) -> bool:
+        state["calls"] += 1
+        result = state["authorized"]
+        started.set()
+        await release.wait()
+        return result
+
+    async def scenario() -> None:
+        read = asyncio.create_task(is_authorized(1))
+        await started.wait()
+
+        # 读取已拿到旧值，此时写操作提交并失效缓存
+        state["authorized"] = False
+        is_authorized.cache_invalidate(1)
+        release.set()
+
+        assert await read is True
+        assert await is_authorized(1) is False
+        assert state["calls"] == 2
+
+    asyncio.run(scenario())
+
+
+def test_default_arguments_share_cache_entry():
+    """补全默认值后相同的调用命中同一条缓存"""
+    calls = []
+
+    @async_ttl_cache(maxsize=16, ttl=60)
+    async def lookup(user_id: int, group_id: int | None = None) -> int:
+        calls.append((user_id, group_id))
+        return user_id
+
+    async def scenario() -> None:
+        await lookup(1)
+        await lookup(1, None)
+        await lookup(1, group_id=None)
+        assert len(calls) == 1
+
+        lookup.cache_invalidate(1)
+        await lookup(1)
+        assert len(calls) == 2
+
+    asyncio.run(scenario())
@@ -0,0 +1,30 @@
+"""SQLAlchemy 引擎配置测试"""
+
+from src.database.engine import _build_connect_args
+
+_BASE_CONFIG = {
+    "statement_cache_size": 500,
+    "disable_jit": True,
+    "connect_timeout": 10.0,
+    "command_timeout": 60.0,
+}
+
+
+def test_connect_args_direct_connection():
+    """直连时启用语句缓存并发送 server_settings"""
+    args = _build_connect_args({**_BASE_CONFIG, "use_pgbouncer": False})
+
+    assert args["statement_cache_size"] == 500
+    assert args["server_settings"]["jit"] == "off"
+    assert "prepared_statement_name_func" not in args
+
+
+def test_connect_args_pgbouncer():
+    """PgBouncer 模式下不发送启动参数，且预处理语句名唯一"""
+    args = _build_connect_args({**_BASE_CONFIG, "use_pgbouncer": True})
+
+    assert "server_settings" not in args
+    assert args["statement_cache_size"] == 0
+    assert args["prepared_statement_cache_size"] == 0
+    name_func = args["prepared_statement_name_func"]
+    assert name_func() != name_func()
@@ -0,0 +1,25 @@
+"""消息处理器测试"""
+
+from src.bot.message_handlers import _to_reply_markdown, _utf16_length
+
+
+def test_reply_markdown_short_text_unchanged():
+    """未超限时只做格式转换"""
+    assert _to_reply_markdown("你好", 4000) == "你好"
+
+
+def test_reply_markdown_truncates_with_escaped_ellipsis():
+    """超限时结果不超过限制，且结尾的省略号已转义"""
+    text = "a.b! " * 2000
+    result = _to_reply_markdown(text, 4000)
+
+    assert _utf16_length(result) <= 4000
+    assert result.endswith("\\.\\.\\.")
+
+
+def test_reply_markdown_counts_utf16_units():
+    """按 UTF-16 码元计算长度，代理对字符计为 2"""
+    result = _to_reply_markdown("😀. " * 3000, 4000)
+
+    assert _utf16_length(result) <= 4000
+    assert result.endswith("\\.\\.\\.")